@@ -0,0 +1,2 @@
+"""Defines offline benchmarks of OpenFOAM metamodel hot paths
+"""
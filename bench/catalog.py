@@ -0,0 +1,111 @@
+"""Defines synthetic OpenFOAM catalogs modeled on the viscosity artefacts
+"""
+import copy
+import typing
+
+from metafoam.common import JSDocument, JSSchema, Name, Names, definition2schema
+
+Models = ['BirdCarreau', 'Casson', 'CrossPowerLaw', 'HerschelBulkley', 'Newtonian', 'powerLaw', 'strainRateFunction']
+Attrs = ['k', 'm', 'n', 'nu', 'nu0', 'nu1', 'nu2', 'nuInf', 'nuMax', 'nuMin', 'tau0']  #: 'lookup' names in the artefacts
+Types = (('scalar', 'number', 1.5), ('word', 'string', 'linear'), ('switch', 'boolean', True))  #: 'type', JSON type, value
+Category = 'viscosity'  #: the category all the models belong to
+
+
+def type_definitions() -> JSSchema:
+    "Composes attribute 'type' definitions (with 'title' to be available in the 'definitions' namespace)"
+    result: JSSchema = {}
+    for typ, json_type, _ in Types:
+        result['{}-type'.format(typ)] = {'title': typ, 'type': 'object', 'properties': {
+            'name': {'type': 'string'},
+            'value': {'type': json_type},
+        }, 'required': ['name'], 'additionalProperties': False}
+        result['{}-attr'.format(typ)] = {'title': '{}_attr'.format(typ), 'type': 'object', 'properties': {
+            typ: {'$ref': '#/definitions/{}-type'.format(typ)},
+        }, 'required': [typ], 'additionalProperties': False}
+    return result
+
+
+def core_schema() -> JSSchema:
+    "Composes 'run-time' core schema"
+    definitions = type_definitions()
+    definitions.update({
+        'attrs': {'type': 'array', 'items': {'oneOf': [
+            {'$ref': '#/definitions/{}-attr'.format(typ)} for typ, _, _ in Types
+        ]}, 'uniqueItems': True},
+        'model': {'type': 'object', 'properties': {
+            'name': {'type': 'string'},
+            'attrs': {'$ref': '#/definitions/attrs'},
+        }, 'required': ['name', 'attrs'], 'additionalProperties': False},
+        'models': {'type': 'array', 'items': {'$ref': '#/definitions/model'}, 'uniqueItems': True},
+        'names': {'type': 'array', 'items': {'type': 'string'}, 'uniqueItems': True},
+        'category': {'type': 'object', 'properties': {
+            'name': {'type': 'string'},
+            'models': {'$ref': '#/definitions/names'},
+        }, 'required': ['name', 'models'], 'additionalProperties': False},
+        'categories': {'type': 'array', 'items': {'$ref': '#/definitions/category'}, 'uniqueItems': True},
+        'transport': {'type': 'object', 'properties': {
+            'models': {'$ref': '#/definitions/models'},
+            'categories': {'$ref': '#/definitions/categories'},
+        }, 'required': ['models', 'categories'], 'additionalProperties': False},
+        'core': {'type': 'object', 'properties': {
+            'transport': {'$ref': '#/definitions/transport'},
+        }, 'required': ['transport'], 'additionalProperties': False},
+    })
+    schema = {'title': 'catalog', 'definitions': definitions}
+    definition2schema(schema, 'core')
+    return schema
+
+
+def solver_schema() -> JSSchema:
+    "Composes 'run-time' solver schema"
+    schema: JSSchema = {'definitions': {
+        'solver': {'type': 'object', 'properties': {
+            'transport': {'type': 'string'},
+        }, 'required': ['transport'], 'additionalProperties': False},
+    }}
+    definition2schema(schema, 'solver')
+    return schema
+
+
+def model_names(models: int) -> Names:
+    "Composes unique model names"
+    return [Models[index] if index < len(Models) else '{}{}'.format(Models[index % len(Models)], index)
+            for index in range(models)]
+
+
+def attr_names(attrs: int) -> Names:
+    "Composes unique attribute names"
+    return [Attrs[index] if index < len(Attrs) else '{}{}'.format(Attrs[index % len(Attrs)], index) for index in range(attrs)]
+
+
+def model_attrs(attrs: int) -> typing.List[JSDocument]:
+    "Composes attributes of a model, every third one without default 'value'"
+    result = []
+    for index, name in enumerate(attr_names(attrs)):
+        typ, _, value = Types[index % len(Types)]
+        body: JSDocument = {'name': name}
+        if index % 3 != 2:
+            body['value'] = value
+        result.append({typ: body})
+    return result
+
+
+def core_document(models: int, attrs: int) -> JSDocument:
+    "Composes core document with the given number of models, each having the given number of attributes"
+    names = model_names(models)
+    template = model_attrs(attrs)
+    return {'transport': {
+        'models': [{'name': name, 'attrs': copy.deepcopy(template)} for name in names],
+        'categories': [{'name': Category, 'models': names}],
+    }}
+
+
+def solver_document() -> JSDocument:
+    "Composes solver document referring to the catalog category"
+    return {'transport': Category}
+
+
+def source(models: int, attrs: int) -> typing.Dict[Name, Names]:
+    "Composes 'json_format.handler_json' source (model to attribute names)"
+    names = attr_names(attrs)
+    return dict((name, list(names)) for name in model_names(models))
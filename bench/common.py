@@ -0,0 +1,29 @@
+"""Defines benchmarks common functionality
+"""
+import json
+import sys
+import typing
+
+
+def sizes(text: str) -> typing.List[int]:
+    "Parses comma separated sizes"
+    return [int(item) for item in text.split(',')]
+
+
+def dump(document: typing.Any, path: typing.Optional[str]) -> None:
+    "Writes JSON report to the given file (stdout if none)"
+    text = json.dumps(document, indent=2, sort_keys=True)
+    if path:
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write(text + '\n')
+    else:
+        sys.stdout.write(text + '\n')
+
+
+def conclude(report: typing.Dict[str, typing.Any], failures: typing.List[str], path: typing.Optional[str]) -> int:
+    "Writes JSON report with the budget failures, reports them and returns exit status"
+    report['failures'] = failures
+    dump(report, path)
+    for failure in failures:
+        sys.stderr.write('over budget: {}\n'.format(failure))
+    return 1 if failures else 0
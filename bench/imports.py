@@ -0,0 +1,77 @@
+"""Defines import time budget checks of OpenFOAM metamodel ('python -m bench.imports --help')
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import typing
+
+from .common import conclude
+
+Statements = {
+    'metafoam': 'import metafoam',
+    'core': 'from metafoam import Core',
+    'cli': 'import metafoam.__main__',
+}  #: measured imports by name
+Heavy = ('jsonschema', 'python_jsonschema_objects')  #: dependencies which should only be imported on first use
+Budgets = {
+    'metafoam': 0.05,
+    'core': 0.075,  # 'hashlib', 'json', 'threading' are used on the validation path
+    'cli': 0.15,  # command modules pull 'concurrent.futures', 'multiprocessing', 'cProfile' in
+}  #: default seconds per import (on top of bare interpreter start)
+
+
+def elapsed(statement: str) -> float:
+    "Returns wall clock time of a fresh interpreter running the statement"
+    started = time.perf_counter()
+    subprocess.check_call([sys.executable, '-c', statement])
+    return time.perf_counter() - started
+
+
+def heavy(statement: str) -> typing.List[str]:
+    "Lists heavy modules the statement imports"
+    code = '{}\nimport sys\nprint(" ".join(name for name in sys.modules if name.split(".")[0] in {!r}))'.format(
+        statement, Heavy
+    )
+    return subprocess.check_output([sys.executable, '-c', code], universal_newlines=True).split()
+
+
+def measure(statement: str, repeat: int) -> float:
+    "Returns median import time on top of bare interpreter start"
+    baseline = statistics.median(elapsed('pass') for _ in range(repeat))
+    return max(0.0, statistics.median(elapsed(statement) for _ in range(repeat)) - baseline)
+
+
+def budget(text: str) -> typing.Tuple[str, float]:
+    "Parses 'name=seconds' budget"
+    name, _, value = text.partition('=')
+    if name not in Statements:
+        raise argparse.ArgumentTypeError('unknown import {!r}'.format(name))
+    return name, float(value)
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    "Measures import times, writes JSON report and fails when over budget or heavy dependencies are imported eagerly"
+    parser = argparse.ArgumentParser(prog='bench.imports', description=__doc__)
+    parser.add_argument('--repeat', type=int, default=7, help='fresh interpreters per import (default: %(default)s)')
+    parser.add_argument('--budget', type=budget, action='append', default=[],
+                        help="seconds for an import, e.g. 'core=0.1' (default: {})".format(Budgets))
+    parser.add_argument('--output', help='report file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    failures: typing.List[str] = []
+    budgets = dict(Budgets, **dict(args.budget))
+    report: typing.Dict[str, typing.Any] = {'budgets': budgets, 'results': {}}
+    for name, statement in Statements.items():
+        seconds, modules = measure(statement, args.repeat), heavy(statement)
+        report['results'][name] = {'statement': statement, 'seconds': seconds, 'heavy': modules}
+        if seconds > budgets[name]:
+            failures.append('{}: {:.3f} > {} s'.format(name, seconds, budgets[name]))
+        if modules:
+            failures.append('{}: imports {}'.format(name, ', '.join(sorted(modules))))
+    return conclude(report, failures, args.output)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
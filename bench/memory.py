@@ -0,0 +1,118 @@
+"""Defines per phase memory budget checks of OpenFOAM metamodel ('python -m bench.memory --help')
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+import typing
+
+import metafoam
+from metafoam import namespace
+
+from . import catalog
+from .common import conclude, sizes
+
+Phases = ('validate', 'build_classes', 'index', 'attr')  #: measured phases (in the order they run)
+Budgets = {
+    'validate': 32768,  # 'uniqueItems' keeps transient frozen copies of the models, so grows with attributes (about 50)
+    'build_classes': 32768,  # does not depend on the catalog size, so only makes sense from 10 models on
+    'index': 2048,
+    'attr': 32768,  # about 50 attributes per model
+}  #: default peak bytes per model (per phase)
+
+
+class Usage(typing.NamedTuple):
+    "Describes memory allocated by a phase"
+    peak: int  #: bytes
+    retained: int  #: bytes still allocated once the phase is over
+
+
+def trace(function: typing.Callable[[], typing.Any]) -> typing.Tuple[typing.Any, Usage]:
+    "Runs the function, tracing allocations made while it runs"
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, Usage(peak, current)
+
+
+def warm_up() -> None:
+    "Imports 'jsonschema'/'pjs' and compiles the catalog validators once, so that the first measured catalog does not pay"
+    core = metafoam.Core(catalog.core_document(1, 1), catalog.core_schema())
+    metafoam.Solver(catalog.solver_document(), catalog.solver_schema(), core)
+
+
+def measure(models: int, attrs: int) -> typing.Dict[str, Usage]:
+    "Measures every phase of 'Core'/'Solver' life for the synthetic catalog of the given size"
+    warm_up()
+    document, schema = catalog.core_document(models, attrs), catalog.core_schema()
+    core = metafoam.Core(document, schema, lazy=True)
+    namespace.invalidate(schema)  # 'build_classes' should not be served from the process-wide cache
+
+    usages = {}
+    _, usages['validate'] = trace(core.validate)
+    _, usages['build_classes'] = trace(core.namespace)
+    _, usages['index'] = trace(lambda: core.index('transport'))
+
+    transport = metafoam.Solver(catalog.solver_document(), catalog.solver_schema(), core).transport
+
+    def instantiate() -> typing.List[typing.Any]:
+        "Instantiates attributes of every model"
+        instances: typing.List[typing.Any] = []
+        for model in core.models('transport'):
+            transport.model = model
+            instances.extend(transport.attr(name) for name in transport.attrs)
+        return instances
+
+    _, usages['attr'] = trace(instantiate)
+    return usages
+
+
+def check(usages: typing.Mapping[str, Usage], models: int, budgets: typing.Mapping[str, int]) -> typing.List[str]:
+    "Lists phases which exceed per model budget with their peak"
+    return [
+        '{}: {:.0f} > {} bytes per model'.format(phase, usages[phase].peak / models, budgets[phase])
+        for phase in Phases if phase in budgets and usages[phase].peak > budgets[phase] * models
+    ]
+
+
+def budget(text: str) -> typing.Tuple[str, int]:
+    "Parses 'phase=bytes' budget"
+    phase, _, value = text.partition('=')
+    if phase not in Phases:
+        raise argparse.ArgumentTypeError('unknown phase {!r}'.format(phase))
+    return phase, int(value)
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    "Measures memory per phase, writes JSON report and fails when per model budgets are exceeded"
+    parser = argparse.ArgumentParser(prog='bench.memory', description=__doc__)
+    parser.add_argument('--models', type=sizes, default=[10, 100, 1000], help='catalog sizes')
+    parser.add_argument('--attrs', type=sizes, default=[10], help='attributes per model')
+    parser.add_argument('--budget', type=budget, action='append', default=[],
+                        help="peak bytes per model for a phase, e.g. 'index=4096' (default: {})".format(Budgets))
+    parser.add_argument('--output', help='report file (default: stdout)')
+    args = parser.parse_args(argv)
+    budgets = dict(Budgets, **dict(args.budget))
+
+    report: typing.Dict[str, typing.Any] = {'budgets': budgets, 'results': {}}
+    failures: typing.List[str] = []
+    for models in args.models:
+        for attrs in args.attrs:
+            key = '{}x{}'.format(models, attrs)
+            usages = measure(models, attrs)
+            report['results'][key] = dict((phase, usage._asdict()) for phase, usage in usages.items())
+            failures.extend('{} {}'.format(key, failure) for failure in check(usages, models, budgets))
+            for phase in Phases:
+                sys.stderr.write('{:>12} {:>14} peak {:12d} retained {:12d} bytes\n'.format(
+                    key, phase, usages[phase].peak, usages[phase].retained
+                ))
+    return conclude(report, failures, args.output)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Defines timing benchmarks of OpenFOAM metamodel hot paths ('python -m bench.timing --help')
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import typing
+
+import metafoam
+from metafoam import common, json_format
+
+from . import catalog
+from .common import dump, sizes
+
+Statement = typing.Callable[[], typing.Any]  #: typedef on timed statement
+Setup = typing.Callable[[int, int], Statement]  #: typedef on benchmark prepared for the given catalog size
+Results = typing.Dict[str, typing.Dict[str, typing.Dict[str, float]]]  #: typedef on 'benchmark' to 'size' to timings
+
+
+def core_init(models: int, attrs: int) -> Statement:
+    "Times 'Core' construction (validation, indexes and warm 'definitions' namespace)"
+    document, schema = catalog.core_document(models, attrs), catalog.core_schema()
+    return lambda: metafoam.Core(document, schema)
+
+
+def validate_model(models: int, attrs: int) -> Statement:
+    "Times core document validation"
+    document, schema = catalog.core_document(models, attrs), catalog.core_schema()
+    return lambda: common.validate_model(document, schema)
+
+
+def validate_solver(models: int, attrs: int) -> Statement:
+    "Times solver document validation against the core document"
+    document, schema, core = catalog.solver_document(), catalog.solver_schema(), catalog.core_document(models, attrs)
+    return lambda: common.validate_solver(document, schema, core)
+
+
+def transport_attr(models: int, attrs: int) -> Statement:
+    "Times instantiation of all the attributes of the last model"
+    core = metafoam.Core(catalog.core_document(models, attrs), catalog.core_schema())
+    transport = metafoam.Solver(catalog.solver_document(), catalog.solver_schema(), core).transport
+    transport.model = catalog.model_names(models)[-1]
+    names = transport.attrs
+    return lambda: [transport.attr(name) for name in names]
+
+
+def handler_json(models: int, attrs: int) -> Statement:
+    "Times core document composition from extracted model attributes"
+    source = catalog.source(models, attrs)
+    return lambda: json_format.handler_json(source)
+
+
+Benchmarks: typing.Dict[str, Setup] = {
+    'core_init': core_init,
+    'validate_model': validate_model,
+    'validate_solver': validate_solver,
+    'transport_attr': transport_attr,
+    'handler_json': handler_json,
+}  #: benchmarks by name
+
+
+def measure(statement: Statement, repeat: int) -> typing.Dict[str, float]:
+    "Returns the best and median time per call (seconds)"
+    timer = timeit.Timer(statement)
+    number, _ = timer.autorange()
+    timings = [timing / number for timing in timer.repeat(repeat, number)]
+    return {'number': number, 'best': min(timings), 'median': statistics.median(timings)}
+
+
+def revision() -> str:
+    "Returns current git revision ('' if unknown)"
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True,
+                              universal_newlines=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run(names: typing.Iterable[str], models: typing.Iterable[int], attrs: typing.Iterable[int], repeat: int) -> Results:
+    "Runs the given benchmarks for all the catalog sizes"
+    results: Results = {}
+    for name in names:
+        results[name] = {}
+        for size in models:
+            for count in attrs:
+                key = '{}x{}'.format(size, count)
+                results[name][key] = measure(Benchmarks[name](size, count), repeat)
+                sys.stderr.write('{:>16} {:>12} {:12.6f} s\n'.format(name, key, results[name][key]['best']))
+    return results
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> typing.List[str]:
+    "Lists benchmarks which became slower than the baseline by more than the given factor"
+    regressions = []
+    for name, timings in sorted(results.items()):
+        for key, timing in sorted(timings.items()):
+            before = baseline.get(name, {}).get(key)
+            if before is not None and timing['best'] > before['best'] * threshold:
+                regressions.append('{} {}: {:.6f} s -> {:.6f} s ({:.2f}x)'.format(
+                    name, key, before['best'], timing['best'], timing['best'] / before['best']
+                ))
+    return regressions
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    "Runs benchmarks, stores results as JSON and compares them with the baseline ones"
+    parser = argparse.ArgumentParser(prog='bench.timing', description=__doc__)
+    parser.add_argument('--only', nargs='+', choices=sorted(Benchmarks), default=list(Benchmarks), help='benchmarks to run')
+    parser.add_argument('--models', type=sizes, default=[10, 100, 1000], help='catalog sizes (up to 100000, slow)')
+    parser.add_argument('--attrs', type=sizes, default=[1, 10, 50], help='attributes per model')
+    parser.add_argument('--repeat', type=int, default=5, help='measurements per benchmark (default: %(default)s)')
+    parser.add_argument('--output', help='results file (default: stdout)')
+    parser.add_argument('--compare', help='baseline results file to compare with')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown factor (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    results = run(args.only, args.models, args.attrs, args.repeat)
+    document = {
+        'meta': {'revision': revision(), 'python': platform.python_version(), 'platform': platform.platform(),
+                 'time': time.time()},
+        'results': results,
+    }
+    dump(document, args.output)
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare, encoding='utf-8') as stream:
+        regressions = compare(results, json.load(stream)['results'], args.threshold)
+    for regression in regressions:
+        sys.stderr.write('regression: {}\n'.format(regression))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,32 @@
 """Defines metamodel for OpenFOAM
 """
+import importlib
+import sys
+import types
+import typing
 
-from .core import Core
-from .solver import Solver
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from .core import Core
+    from .solver import Solver
 
 __all__ = ['Core', 'Solver']
+
+Lazy = {'Core': 'core', 'Solver': 'solver'}  #: attributes imported from submodules on first access
+
+
+class _Package(types.ModuleType):
+    "Imports 'Core'/'Solver' (and so their heavy dependencies) only when first accessed"
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if name not in Lazy:
+            raise AttributeError("module '{}' has no attribute '{}'".format(self.__name__, name))
+
+        value = getattr(importlib.import_module('.' + Lazy[name], self.__name__), name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self) -> typing.List[str]:
+        return sorted(set(super().__dir__()) | set(Lazy))
+
+
+sys.modules[__name__].__class__ = _Package  # module level '__getattr__' is only available since Python 3.7
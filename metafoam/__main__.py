@@ -0,0 +1,27 @@
+"""Defines command line entry point for OpenFOAM metamodel
+"""
+import argparse
+import sys
+import typing
+
+from . import artefacts, codegen, extract, parallel, profiling
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    "Parses command line and runs the requested command"
+    parser = argparse.ArgumentParser(prog='metafoam', description=__doc__)
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    codegen.arguments(commands.add_parser('generate', help="generate 'definitions' namespace module"))
+    parallel.arguments(commands.add_parser('validate', help="validate 'core'/'solver' documents in parallel"))
+    extract.arguments(commands.add_parser('extract', help='extract models and their attributes from OpenFOAM sources'))
+    artefacts.arguments(commands.add_parser('check-artefacts', help='check extracted artefacts of many forks concurrently'))
+    profiling.arguments(commands.add_parser('profile', help="profile 'core'/'solver' pair"))
+
+    args = parser.parse_args(argv)
+    return int(args.run(args))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Defines concurrent check of extracted OpenFOAM artefacts against references for many forks
+"""
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import sys
+import time
+import typing
+
+from .common import Name, Names
+from .extract import Extraction, extract
+
+Artefacts = os.path.join('artefacts', 'viscosity')  #: default references location
+ModelsDir = os.path.join('src', 'transportModels')  #: models sources location inside a fork checkout
+
+
+class Diff(typing.NamedTuple):
+    "Describes how the extraction differs from the references (compared as sets)"
+    added_models: Names
+    removed_models: Names
+    added_attrs: typing.Dict[Name, Names]  #: per model attributes which are not in the references
+    removed_attrs: typing.Dict[Name, Names]  #: per model referenced attributes which are not extracted anymore
+
+    @property
+    def empty(self) -> bool:
+        "Tells whether there are no differences"
+        return not (self.added_models or self.removed_models or self.added_attrs or self.removed_attrs)
+
+
+NoDiff = Diff([], [], {}, {})  #: shared outcome of matching extraction
+
+
+class Outcome(typing.NamedTuple):
+    "Describes check of a single fork"
+    fork: Name
+    elapsed: float  #: seconds
+    diff: Diff
+    error: typing.Optional[str]  #: why the fork could not be checked
+    found: typing.Optional[Extraction]  #: what was extracted
+
+    @property
+    def valid(self) -> bool:
+        "Tells whether the extraction matches the references"
+        return self.error is None and self.diff.empty
+
+    def record(self) -> typing.Dict[str, typing.Any]:
+        "Describes the outcome as JSON"
+        return {'valid': self.valid, 'elapsed': self.elapsed, 'error': self.error, 'diff': self.diff._asdict()}
+
+
+def forks(artefacts: str) -> Names:
+    "Lists configured forks (the ones having references)"
+    return sorted(os.path.basename(path)[:-len('.ref')] for path in glob.glob(os.path.join(artefacts, '*.ref')))
+
+
+def lines(path: str) -> Names:
+    "Reads reference lines ignoring changes in the amount of white space (as 'diff --ignore-space-change' does)"
+    with open(path, encoding='utf-8') as stream:
+        return [' '.join(line.split()) for line in stream]
+
+
+def reference(artefacts: str, fork: Name) -> Extraction:
+    "Loads references of the given fork (none for a new one)"
+    path = os.path.join(artefacts, '{}.ref'.format(fork))
+    models = lines(path) if os.path.exists(path) else []
+    attrs = {}
+    for path in sorted(glob.glob(os.path.join(artefacts, fork, '*.ref'))):
+        attrs[os.path.basename(path)[:-len('.ref')]] = lines(path)
+    return Extraction(models, attrs)
+
+
+def references(artefacts: str, names: Names) -> typing.Dict[Name, Extraction]:
+    "Loads references of all the given forks"
+    return dict((fork, reference(artefacts, fork)) for fork in names)
+
+
+def compare(found: Extraction, expected: Extraction) -> Diff:
+    "Compares the extraction with references as sets of models and per model sets of attributes"
+    added: typing.Dict[Name, Names] = {}
+    removed: typing.Dict[Name, Names] = {}
+    for model in set(found.attrs) | set(expected.attrs):
+        names, referenced = set(found.attrs.get(model, ())), set(expected.attrs.get(model, ()))
+        if names - referenced:
+            added[model] = sorted(names - referenced)
+        if referenced - names:
+            removed[model] = sorted(referenced - names)
+
+    models, referenced = set(found.models), set(expected.models)
+    diff = Diff(sorted(models - referenced), sorted(referenced - models), added, removed)
+    return NoDiff if diff.empty else diff
+
+
+def check(fork: Name, foam: str, expected: Extraction) -> Outcome:
+    "Extracts artefacts of the fork checkout and compares them with references in memory"
+    started = time.perf_counter()
+    root = os.path.join(foam, ModelsDir)
+    if not os.path.isdir(root):
+        return Outcome(fork, time.perf_counter() - started, NoDiff, 'no {} checkout'.format(root), None)
+
+    found = extract(root)
+    return Outcome(fork, time.perf_counter() - started, compare(found, expected), None, found)
+
+
+def check_all(
+    names: Names, root: str = '.', artefacts: str = Artefacts, jobs: typing.Optional[int] = None
+) -> typing.Iterator[Outcome]:
+    "Checks the given forks concurrently (each one in its own worker process), yielding outcomes as they complete"
+    expected = references(artefacts, names)
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        futures = [pool.submit(check, fork, os.path.join(root, fork), expected[fork]) for fork in names]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+
+def write(path: str, names: Names) -> None:
+    "Writes reference lines"
+    with open(path, 'w', encoding='utf-8') as stream:
+        stream.writelines(name + '\n' for name in names)
+
+
+def update(artefacts: str, fork: Name, found: Extraction) -> None:
+    "Replaces references of the fork with the extraction (as 'txt2ref' does), dropping the ones of vanished models"
+    write(os.path.join(artefacts, '{}.ref'.format(fork)), found.models)
+    os.makedirs(os.path.join(artefacts, fork), exist_ok=True)
+    for path in glob.glob(os.path.join(artefacts, fork, '*.ref')):
+        if os.path.basename(path)[:-len('.ref')] not in found.attrs:
+            os.remove(path)
+    for model, names in found.attrs.items():
+        write(os.path.join(artefacts, fork, '{}.ref'.format(model)), names)
+
+
+def arguments(parser: argparse.ArgumentParser) -> None:
+    "Defines 'check-artefacts' command line arguments"
+    parser.add_argument('forks', nargs='*', help='forks to check (default: all having references)')
+    parser.add_argument('--root', default='.', help='directory with fork checkouts (default: %(default)s)')
+    parser.add_argument('--artefacts', default=Artefacts, help='references directory (default: %(default)s)')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='worker processes (default: per CPU count)')
+    parser.add_argument('--update', action='store_true', help='replace differing references with the extraction')
+    parser.set_defaults(run=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    "Runs 'check-artefacts' command, writing one JSON report with per-fork differences"
+    started = time.perf_counter()
+    names = args.forks or forks(args.artefacts)
+
+    outcomes = dict((outcome.fork, outcome) for outcome in check_all(names, args.root, args.artefacts, args.jobs))
+    invalid = [fork for fork in names if not outcomes[fork].valid]
+    updated = []
+    if args.update:
+        for fork in invalid:
+            found = outcomes[fork].found
+            if found is not None:
+                update(args.artefacts, fork, found)
+                updated.append(fork)
+
+    report = {
+        'forks': dict((fork, outcomes[fork].record()) for fork in names),
+        'total': len(names),
+        'valid': len(names) - len(invalid),
+        'invalid': len(invalid),
+        'updated': updated,
+        'elapsed': time.perf_counter() - started,
+    }
+    sys.stdout.write(json.dumps(report, indent=2) + '\n')
+    return 1 if len(invalid) > len(updated) else 0
@@ -0,0 +1,51 @@
+"""Defines batch validation of many OpenFOAM 'solver' documents against one core
+"""
+import typing
+
+from .common import JSDocument, JSSchema
+from .common import check, validator
+from .cache import fingerprint
+from .index import Categories
+
+
+class Result(typing.NamedTuple):
+    "Describes validation outcome of a single document"
+    error: typing.Optional[Exception]  #: 'None' for valid documents
+
+    @property
+    def valid(self) -> bool:
+        "Tells whether the document passed validation"
+        return self.error is None
+
+
+Valid = Result(None)  #: shared outcome of valid documents
+
+
+def validate_solver(document: JSDocument, compiled: typing.Any, category2models: Categories) -> Result:
+    "Validates single 'solver' document with already compiled validator and core categories index"
+    import jsonschema as js  # pylint: disable=import-outside-toplevel
+
+    try:
+        check(document, compiled)
+        assert document['transport'] in category2models
+    except (js.exceptions.ValidationError, AssertionError, KeyError, TypeError) as error:
+        return Result(error)
+
+    return Valid
+
+
+def validate_solvers(
+    documents: typing.Iterable[JSDocument], schema: JSSchema, category2models: Categories
+) -> typing.List[Result]:
+    "Validates 'solver' documents, each distinct one only once, without stopping on failures"
+    compiled = validator(schema)
+    seen: typing.Dict[str, Result] = {}
+
+    results = []
+    for document in documents:
+        digest = fingerprint(document)
+        if digest not in seen:
+            seen[digest] = validate_solver(document, compiled, category2models)
+        results.append(seen[digest])
+
+    return results
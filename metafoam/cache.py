@@ -0,0 +1,77 @@
+"""Defines process-wide caching helpers for OpenFOAM metamodel
+"""
+import collections
+import hashlib
+import json
+import threading
+import typing
+
+Key = typing.TypeVar('Key')
+Item = typing.TypeVar('Item')
+
+
+class CacheInfo(typing.NamedTuple):
+    "Describes cache statistics (mirrors 'functools.lru_cache' one)"
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def fingerprint(document: typing.Any) -> str:
+    "Calculates stable content hash for the given JSON document"
+    text = json.dumps(document, sort_keys=True, separators=(',', ':'), default=repr)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class LRUCache(typing.Generic[Key, Item]):
+    "Provides thread-safe bounded cache with 'least recently used' eviction"
+    __slots__ = ('_items', '_maxsize', '_hits', '_misses', '_lock')
+
+    def __init__(self, maxsize: int):
+        assert maxsize > 0, maxsize
+        self._items: 'collections.OrderedDict[Key, Item]' = collections.OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: Key, factory: typing.Callable[[], Item]) -> Item:
+        "Returns cached item, creating it with 'factory' on miss"
+        with self._lock:
+            if key in self._items:
+                self._hits += 1
+                self._items.move_to_end(key)
+                return self._items[key]
+
+            self._misses += 1
+            item = factory()
+            self._items[key] = item
+            if len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+            return item
+
+    def discard(self, key: Key) -> bool:
+        "Drops the given entry, returns whether it was cached"
+        with self._lock:
+            return self._items.pop(key, None) is not None
+
+    def clear(self) -> None:
+        "Drops all entries and resets statistics"
+        with self._lock:
+            self._items.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        "Returns cache statistics"
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._items))
+
+    def resize(self, maxsize: int) -> None:
+        "Changes cache capacity evicting the oldest entries if needed"
+        assert maxsize > 0, maxsize
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._items) > maxsize:
+                self._items.popitem(last=False)
@@ -0,0 +1,242 @@
+"""Defines ahead-of-time generation of 'definitions' namespace modules for OpenFOAM metamodel
+
+Only 'attribute' like definitions ('object' with scalar typed properties and no additional ones)
+are turned into plain '__slots__' classes; everything else is built by 'python_jsonschema_objects'
+on demand through the fallback namespace (see 'metafoam.namespace.Generated').
+"""
+import argparse
+import importlib
+import importlib.util
+import json
+import keyword
+import os
+import sys
+import types
+import typing
+
+from .common import JSSchema, Name, definition2schema
+from .cache import fingerprint
+from . import namespace
+
+Scalars = ('boolean', 'integer', 'number', 'null', 'string', 'array', 'object')  #: supported property 'type' values
+PropertyKeys = {'type', 'title', 'description'}  #: supported property schema keywords
+ObjectKeys = {'type', 'title', 'description', 'properties', 'required', 'additionalProperties'}  #: same for definitions
+
+Header = '''"""Generated by 'metafoam generate', do not edit
+"""
+from python_jsonschema_objects.validators import ValidationError
+
+SCHEMA_HASH = {schema_hash!r}
+OPTIONS = {options!r}
+
+
+def _is_boolean(value):
+    return isinstance(value, bool)
+
+
+def _is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_null(value):
+    return value is None
+
+
+def _is_string(value):
+    return isinstance(value, str)
+
+
+def _is_array(value):
+    return isinstance(value, list)
+
+
+def _is_object(value):
+    return isinstance(value, dict)
+
+
+class _Property:
+    __slots__ = ('name', 'slot', 'checks', 'types')
+
+    def __init__(self, name, *types):
+        self.name = name
+        self.slot = '_' + name
+        self.checks = tuple(globals()['_is_' + typ] for typ in types)
+        self.types = types
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance, self.slot)
+
+    def __set__(self, instance, value):
+        if not any(check(value) for check in self.checks):
+            raise ValidationError("{{0!r}} is not any of {{1}} for '{{2}}' in {{3}}".format(
+                value, list(self.types), self.name, type(instance).__name__))
+        object.__setattr__(instance, self.slot, value)
+
+
+class _Object:
+    __slots__ = ()
+    __title__ = None
+    __required__ = frozenset()
+    __propinfo__ = {{}}
+
+    def __init__(self, **props):
+        for slot in self.__slots__:
+            object.__setattr__(self, slot, None)
+        for name, value in props.items():
+            if value is not None:
+                setattr(self, name, value)
+        if self.__required__:
+            self.validate()
+
+    def __setattr__(self, name, value):
+        if name not in self.__propinfo__:
+            raise ValidationError("Attempted to set unknown property '{{0}}' in {{1}}".format(name, type(self).__name__))
+        object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return '<{{0}} {{1}}>'.format(type(self).__name__, self.as_dict())
+
+    def missing_property_names(self):
+        return sorted(name for name in self.__required__ if getattr(self, name) is None)
+
+    def validate(self):
+        missing = self.missing_property_names()
+        if missing:
+            raise ValidationError("'{{0}}' are required attributes for {{1}}".format(missing, type(self).__name__))
+        return True
+
+    def as_dict(self):
+        return dict((name, getattr(self, name)) for name in self.__propinfo__ if getattr(self, name) is not None)
+'''
+
+Template = '''
+
+class {name}(_Object):
+    "Generated from '#/definitions/{key}'"
+    __slots__ = {slots!r}
+    __title__ = {title!r}
+    __required__ = frozenset({required!r})
+    __propinfo__ = {propinfo!r}
+{properties}
+'''
+
+
+def _property_types(schema: typing.Any) -> typing.Optional[typing.List[str]]:
+    "Returns 'type' list of the given property schema if it can be generated"
+    if not isinstance(schema, dict) or not set(schema) <= PropertyKeys or 'type' not in schema:
+        return None
+
+    types_ = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+    if not types_ or not all(typ in Scalars for typ in types_):
+        return None
+
+    return list(types_)
+
+
+def _identifier(name: typing.Any) -> bool:
+    "Checks whether the given name can be used as Python identifier"
+    return isinstance(name, str) and name.isidentifier() and not keyword.iskeyword(name) and not name.startswith('_')
+
+
+def generated_class(key: Name, schema: typing.Any) -> typing.Optional[str]:
+    "Generates class source for the given definition, if supported"
+    if not isinstance(schema, dict) or not set(schema) <= ObjectKeys or schema.get('type') != 'object':
+        return None
+    if schema.get('additionalProperties', True) is not False:
+        return None
+
+    name = schema.get('title', key)
+    properties = schema.get('properties', {})
+    if not _identifier(name) or not all(_identifier(item) for item in properties):
+        return None
+
+    propinfo = {}
+    for item, body in properties.items():
+        types_ = _property_types(body)
+        if types_ is None:
+            return None
+        propinfo[item] = tuple(types_)
+
+    required = tuple(schema.get('required', ()))
+    if not set(required) <= set(propinfo):
+        return None
+
+    lines = []
+    for item, typs in propinfo.items():
+        lines.append('    {0} = _Property({0!r}, {1})'.format(item, ', '.join(repr(typ) for typ in typs)))
+
+    return Template.format(
+        name=name,
+        key=key,
+        slots=tuple('_' + item for item in propinfo),
+        title=schema.get('title'),
+        required=required,
+        propinfo=propinfo,
+        properties='\n'.join(lines),
+    )
+
+
+def generate(schema: JSSchema) -> str:
+    "Generates 'definitions' namespace module source for the given (run-time) schema"
+    source = [Header.format(schema_hash=fingerprint(schema), options=namespace.CoreOptions)]
+
+    names = []
+    for key, definition in schema.get('definitions', {}).items():
+        text = generated_class(key, definition)
+        if text is None:
+            continue
+        names.append(definition.get('title', key))
+        source.append(text)
+
+    classes = ', '.join("{0!r}: {0}".format(name) for name in names)
+    source.append('\n\nCLASSES = {{{0}}}\n'.format(classes))
+    return ''.join(source)
+
+
+def write(schema: JSSchema, path: str) -> None:
+    "Generates 'definitions' namespace module into the given file"
+    with open(path, 'w', encoding='utf-8') as stream:
+        stream.write(generate(schema))
+
+
+def load(name: str) -> types.ModuleType:
+    "Imports generated module (by its name or file path) and registers it for the 'Core' usage"
+    if name.endswith('.py'):
+        stem = os.path.splitext(os.path.basename(name))[0]
+        spec = importlib.util.spec_from_file_location(stem, name)
+        assert spec is not None and spec.loader is not None, name
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(name)
+
+    namespace.register(module)
+    return module
+
+
+def arguments(parser: argparse.ArgumentParser) -> None:
+    "Defines 'generate' command line arguments"
+    parser.add_argument('schema', help="JSON schema file with 'definitions'")
+    parser.add_argument('--entity', default='core', help="definition to be used as 'entry' (default: %(default)s)")
+    parser.add_argument('--output', '-o', default='-', help='target module file (default: stdout)')
+    parser.set_defaults(run=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    "Runs 'generate' command"
+    with open(args.schema, encoding='utf-8') as stream:
+        schema = json.load(stream)
+    if 'entry' not in schema.get('properties', {}):
+        definition2schema(schema, args.entity)
+
+    if args.output == '-':
+        sys.stdout.write(generate(schema))
+    else:
+        write(schema, args.output)
+    return 0
@@ -1,7 +1,10 @@
 """Defines OpenFOAM metamodel common functionality
 """
-from typing import Dict, List, Set, Any
-import jsonschema as js
+import copy
+from typing import Dict, List, Optional, Set, Tuple, Any
+
+from .cache import LRUCache, CacheInfo, fingerprint
+from . import fastpath, instrument, results
 
 
 JSDocument = Dict[str, Any]  #: typedef on JSON document
@@ -20,23 +23,260 @@ Attrs = List[Attr]  #: typedef on list of 'attributes'
 Models = Dict[Name, Attrs]  #: typedef on list of 'models'
 
 
+Validators: LRUCache[str, Any] = LRUCache(maxsize=128)  #: compiled validators keyed by schema fingerprint
+Fingerprints: Dict[int, Tuple[JSSchema, Any, str]] = {}  #: schema fingerprints by identity (with a 'strict' content copy)
+
+
+def compile_validator(schema: JSSchema) -> Any:
+    "Checks the given schema against its meta-schema and instantiates corresponding validator"
+    import jsonschema as js  # pylint: disable=import-outside-toplevel
+
+    instrument.count('compile_validator')
+    cls = js.validators.validator_for(schema)
+    cls.check_schema(schema)
+    compiled = compile_schema(schema)
+    accepts = fastpath.predicate(compiled)
+    return cls(compiled) if accepts is None else fastpath.Validator(accepts, cls(compiled))
+
+
+class _Strict:  # pylint: disable=too-few-public-methods
+    "Wraps JSON number/boolean to compare equal to the same type values only (telling '1', '1.0' and 'true' apart)"
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self.value) and other == self.value
+
+
+def strict(value: Any) -> Any:
+    "Returns copy of JSON value comparing equal ('copy == value') to equal and the same typed JSON values only"
+    if isinstance(value, dict):
+        return dict((key, strict(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return [strict(item) for item in value]
+    if isinstance(value, (bool, int, float)):
+        return _Strict(value)
+    return value
+
+
+def _fingerprint(schema: JSSchema) -> str:
+    "Returns schema fingerprint, hashing only schemas not seen before (or changed in place since)"
+    known = Fingerprints.get(id(schema))
+    if known is not None and known[1] == schema:  # the schema is kept alive, so its 'id' is not reused
+        return known[2]
+
+    result = fingerprint(schema)
+    Fingerprints[id(schema)] = (schema, strict(schema), result)
+    while len(Fingerprints) > Validators.info().maxsize:
+        Fingerprints.pop(next(iter(Fingerprints)), None)
+    return result
+
+
+def validator(schema: JSSchema) -> Any:
+    "Returns (cached) compiled validator for the given schema"
+    return Validators.get(_fingerprint(schema), lambda: compile_validator(schema))
+
+
+def validators_info() -> CacheInfo:
+    "Returns compiled validators cache statistics"
+    return Validators.info()
+
+
+def check(document: JSDocument, compiled: Any) -> None:
+    "Validates the given document as 'run-time' schema 'entry' with already compiled validator"
+    import jsonschema as js  # pylint: disable=import-outside-toplevel
+
+    entry = {'entry': document}
+    error = js.exceptions.best_match(compiled.iter_errors(entry))
+    if error is not None:
+        raise error
+
+
 def validate(document: JSDocument, schema: JSSchema) -> None:
     "Enrich native validation mecahnism to simplify handling 'run-time' schemas"
-    entry = {'entry': document}
-    js.validate(entry, schema)
+    with instrument.span('validate'):
+        cache = results.active()
+        if cache is None:
+            check(document, validator(schema))
+            return
 
+        key = cache.key(document, schema)
+        if key not in cache:
+            check(document, validator(schema))
+            cache.add(key)
 
-def definition2schema(schema: JSSchema, entity: Name) -> None:
-    "Compose 'run-time' schema"
-    assert entity in schema['definitions'], entity
-    entry = {
+
+def entry_schema(pointer: str) -> JSSchema:
+    "Compose 'run-time' schema 'entry' referring to the given JSON pointer"
+    return {
         'title': 'entry',
         'type': 'object',
-        'properties': {'entry': {'$ref': '#/definitions/{}'.format(entity)}},
+        'properties': {'entry': {'$ref': pointer}},
         'required': ['entry'],
         'additionalProperties': False,
     }
-    schema.update(entry)
+
+
+def definition2schema(schema: JSSchema, entity: Name) -> None:
+    "Compose 'run-time' schema"
+    assert entity in schema['definitions'], entity
+    schema.update(entry_schema('#/definitions/{}'.format(entity)))
+
+
+def pointer2schema(schema: JSSchema, pointer: str) -> JSSchema:
+    "Compose (new) 'run-time' schema for the given JSON pointer inside the given schema"
+    result = dict((key, value) for key, value in schema.items() if key in ('$schema', 'definitions'))
+    result.update(entry_schema(pointer))
+    return result
+
+
+def resolve(schema: JSSchema, pointer: str) -> Any:
+    "Resolves local JSON pointer (like '#/definitions/name') inside the given schema"
+    assert pointer.startswith('#'), pointer
+    result: Any = schema
+    for token in pointer[1:].split('/')[1:]:
+        token = token.replace('~1', '/').replace('~0', '~')
+        result = result[int(token)] if isinstance(result, list) else result[token]
+    return result
+
+
+def dereference(schema: JSSchema, pointer: str) -> str:
+    "Follows (local) '$ref' chain starting from the given JSON pointer, returns the final pointer"
+    seen = set()
+    body = resolve(schema, pointer)
+    while isinstance(body, dict) and '$ref' in body:
+        assert pointer not in seen, pointer  # '$ref' cycle
+        seen.add(pointer)
+        pointer = body['$ref']
+        body = resolve(schema, pointer)
+    return pointer
+
+
+Literals = ('enum', 'const', 'default', 'examples')  #: keywords holding JSON values rather than subschemas
+Schemas = ('properties', 'patternProperties', 'definitions', 'dependencies')  #: keywords holding 'name' to subschema maps
+Branch = {'type', 'properties', 'required', 'additionalProperties', 'title', 'description'}  #: keywords of 'oneOf' branch
+
+
+def discriminator(branch: Any) -> Optional[Name]:
+    "Returns the only (required) property of 'object' schema allowing nothing else, like 'x-attr' ('None' otherwise)"
+    if not isinstance(branch, dict) or not set(branch) <= Branch or branch.get('type') != 'object':
+        return None
+    properties = branch.get('properties')
+    if branch.get('additionalProperties') is not False or not isinstance(properties, dict) or len(properties) != 1:
+        return None
+    name: Name = next(iter(properties))
+    return name if branch.get('required') == [name] else None
+
+
+def discriminate(body: JSSchema) -> JSSchema:
+    "Turns 'oneOf' over single key objects (like 'attrs' items) into the equivalent lookup by the key"
+    branches = body['oneOf']
+    names = [discriminator(branch) for branch in branches] if isinstance(branches, list) else [None]
+    if not names or None in names or len(set(names)) != len(names):
+        return body
+
+    dispatch = {
+        'type': 'object',
+        'properties': dict((name, branch['properties'][name]) for name, branch in zip(names, branches)),
+        'additionalProperties': False,  # reports unknown key (instead of failing every branch)
+        'minProperties': 1,
+        'maxProperties': 1,
+    }
+    result = dict((key, value) for key, value in body.items() if key != 'oneOf')
+    if set(result) & set(dispatch):
+        result['oneOf'] = [dispatch]
+    else:
+        result.update(dispatch)
+    return result
+
+
+class _Compiler:
+    "Inlines local '$ref's, keeping only recursive ones (and the definitions they refer to)"
+    __slots__ = ('_schema', '_compiled', '_active', '_kept')
+
+    def __init__(self, schema: JSSchema):
+        self._schema = schema
+        self._compiled: Dict[str, Any] = {}  # shared by all the '$ref's to the same pointer
+        self._active: Set[str] = set()
+        self._kept: Set[str] = set()
+
+    @property
+    def kept(self) -> Dict[str, Any]:
+        "Returns compiled subschemas still referred to by pointer"
+        return dict((pointer, self._compiled[pointer]) for pointer in self._kept)
+
+    def pointer(self, pointer: str) -> Any:
+        "Returns compiled subschema for the given pointer"
+        if pointer in self._compiled:
+            return self._compiled[pointer]
+        if pointer in self._active:
+            self._kept.add(pointer)  # cycle
+            return {'$ref': pointer}
+        try:
+            body = resolve(self._schema, pointer)
+        except (KeyError, IndexError, ValueError, TypeError):
+            return {'$ref': pointer}  # left to fail the same way at validation
+
+        self._active.add(pointer)
+        result = self._compiled[pointer] = self.schema(body)
+        self._active.discard(pointer)
+        return result
+
+    def schema(self, body: Any) -> Any:
+        "Returns compiled (sub)schema"
+        if not isinstance(body, dict):
+            return self._nested(body)
+        if isinstance(body.get('$ref'), str):
+            return self.pointer(body['$ref']) if body['$ref'].startswith('#') else dict(body)
+        result = {}
+        for key, value in body.items():
+            if key in Literals:
+                result[key] = value
+            elif key in Schemas and isinstance(value, dict):
+                result[key] = dict((name, self.schema(item)) for name, item in value.items())
+            else:
+                result[key] = self._nested(value)
+        return discriminate(result) if 'oneOf' in result else result
+
+    def _nested(self, value: Any) -> Any:
+        "Compiles subschemas nested in keyword value (like 'items' or 'oneOf')"
+        if isinstance(value, list):
+            return [self._nested(item) for item in value]
+        if isinstance(value, dict):
+            return self.schema(value)
+        return value
+
+
+def compile_schema(schema: JSSchema, entity: Optional[Name] = None) -> JSSchema:
+    "Returns new 'run-time' schema (composed for 'entity' if given) with '$ref's inlined and unreachable definitions dropped"
+    root = entry_schema('#/definitions/{}'.format(entity.replace('~', '~0').replace('/', '~1'))) if entity else schema
+    compiler = _Compiler(schema)
+    result: JSSchema = compiler.schema(dict((key, value) for key, value in root.items() if key != 'definitions'))
+    if '$schema' in schema:
+        result['$schema'] = schema['$schema']
+
+    prefix = '#/definitions/'
+    kept = compiler.kept
+    if any(not pointer.startswith(prefix) or '/' in pointer[len(prefix):] for pointer in kept):
+        result = copy.deepcopy(schema)  # recursion through something other than a definition is left to the resolver
+        if entity:
+            definition2schema(result, entity)
+        return result
+
+    if kept:
+        names = ((pointer[len(prefix):].replace('~1', '/').replace('~0', '~'), body) for pointer, body in kept.items())
+        result['definitions'] = dict(names)
+    return result
+
+
+def descend(schema: JSSchema, pointer: str, *names: Name) -> str:
+    "Returns pointer to (dereferenced) subschema of nested 'properties' with the given names"
+    pointer = dereference(schema, pointer)
+    for name in names:
+        pointer = dereference(schema, '{}/properties/{}'.format(pointer, name.replace('~', '~0').replace('/', '~1')))
+    return pointer
 
 
 def categories(model: JSDocument) -> Entity2Attrs:
@@ -1,39 +1,191 @@
 """Defines Core metamodel for OpenFOAM
 """
-import copy
+import time
+import types
 import typing
 
-import python_jsonschema_objects as pjs
+from .common import JSDocument, JSSchema, Name
 
-from .common import JSDocument, JSSchema, Name, Entity2Attrs, Models
+from .cache import fingerprint
+from .common import validate, validate_model
+from .index import Index, Categories, ModelAttrs, Type2Class
+from .store import AttrsTable, Missing, Pool, Store
+from .view import MappingView
+from . import namespace, batch
 
-from .common import categories, models, validate_model
+Indexes = typing.Mapping[Name, Index]  #: typedef on read-only OpenFOAM model 'name' to its lookup tables mapping
+
+Snapshotted = ('validate', 'index')  #: construction phases kept in snapshots
+
+
+class Phase(typing.NamedTuple):
+    "Describes when a 'Core' construction phase ran and how long it took"
+    started: float  #: wall clock time stamp
+    elapsed: float  #: seconds
 
 
 class Core:
     "Provides semantic level validation and programming API for an OpenFOAM core"
-    __slots__ = ('_document', '_namespace')
+    __slots__ = ('_document', '_schema', '_namespace', '_indexes', '_classes', '_phases', '_pool')
+
+    def __init__(self, document: JSDocument, schema: JSSchema, lazy: bool = False, pool: typing.Optional[Pool] = None):
+        self._pool = Pool() if pool is None else pool
+        self._document = document  # once indexed, only its not indexed top level fields are kept ('Missing' otherwise)
+        self._schema = schema
+        self._indexes: typing.Optional[Indexes] = None
+        self._namespace: typing.Any = None
+        self._classes: typing.Optional[Type2Class] = None
+        self._phases: typing.Dict[str, Phase] = {}
+
+        if not lazy:
+            self.validate()
+            self._get_indexes()
+            self.namespace()
+
+    def _run(self, phase: str, function: typing.Callable[[], typing.Any]) -> typing.Any:
+        "Runs and records the given construction phase"
+        started = time.time()
+        begin = time.perf_counter()
+        result = function()
+        self._phases[phase] = Phase(started, time.perf_counter() - begin)
+        return result
+
+    def _get_indexes(self) -> Indexes:
+        "Returns lookup tables, building them on first access"
+        if self._indexes is None:
+            document, pool = self._document, self._pool
+            self._indexes = self._run('index', lambda: types.MappingProxyType(dict(
+                (name, Index(Store(body, pool))) for name, body in document.items() if isinstance(body, dict)
+            )))
+            self._document = dict((name, Missing if name in self._indexes else body) for name, body in document.items())
+
+        return self._indexes
 
-    def __init__(self, document: JSDocument, schema: JSSchema):
-        validate_model(document, schema)
-        self._document = document
+    def _fields(self) -> typing.Iterator[typing.Tuple[Name, typing.Any]]:
+        "Iterates over top level fields in the original order (indexed ones as kept in the compact form)"
+        indexes = self._get_indexes()
+        return ((name, indexes[name].store if value is Missing else value) for name, value in self._document.items())
 
-        builder = pjs.ObjectBuilder(schema)
-        self._namespace = builder.build_classes(strict=True, named_only=False, standardize_names=False)
+    def _source(self) -> JSDocument:
+        "Returns the initial document, rebuilding it from the compact form if needed"
+        if self._indexes is None:
+            return self._document
+
+        return dict((name, value.to_document() if isinstance(value, Store) else value) for name, value in self._fields())
 
     @property
-    def document(self) -> JSDocument:
-        "Returns initial document"
-        return copy.copy(self._document)
+    def phases(self) -> typing.Mapping[str, Phase]:
+        "Returns already run construction phases ('validate', 'index', 'namespace' and 'snapshot' if loaded from one)"
+        return types.MappingProxyType(self._phases)
+
+    def _own(self) -> typing.Tuple[typing.Dict[Name, Index], Pool]:
+        "Returns indexes with the pool of this core records only (re-interned if the pool is shared, e.g. by 'Registry')"
+        indexes = self._get_indexes()
+        models = set(model for index in indexes.values() for model in index.store.models)
+        attrs = set(attr for model in models for attr in model.attrs or ())
+        info = self._pool.info()
+        if (info.models, info.attrs) == (len(models), len(attrs)):
+            return dict(indexes), self._pool
+
+        pool = Pool()
+        return dict((name, Index(Store(index.store.to_document(), pool))) for name, index in indexes.items()), pool
+
+    def save_snapshot(self, path: str) -> None:
+        "Stores validated compact document, its indexes and the schema (to rebuild the namespace) as a binary snapshot"
+        from . import snapshot  # pylint: disable=import-outside-toplevel  # 'pickle' is only needed here
+
+        self.validate()
+        indexes, pool = self._own()
+        phases = dict((phase, self._phases[phase]) for phase in Snapshotted)
+        state = (self._schema, indexes, self._document, pool, phases)
+        snapshot.write(path, fingerprint(self._source()), fingerprint(self._schema), state)
+
+    @classmethod
+    def load_snapshot(
+        cls, path: str, document: typing.Optional[JSDocument] = None, schema: typing.Optional[JSSchema] = None,
+        lazy: bool = False
+    ) -> 'Core':
+        "Restores core from trusted snapshot (a pickle), skipping validation while 'document'/'schema' hashes match stored ones"
+        from . import snapshot  # pylint: disable=import-outside-toplevel
+
+        started = time.time()
+        begin = time.perf_counter()
+        header, (stored, indexes, fields, pool, phases) = snapshot.read(path)
+        if schema is None:
+            schema = stored
+        if document is not None and fingerprint(document) != header.document:
+            return cls(document, schema, lazy)
 
-    def categories(self, name: Name) -> Entity2Attrs:
+        core = cls(fields, schema, lazy=True, pool=pool)
+        core._indexes = types.MappingProxyType(indexes)
+        core._phases.update(phases)
+        if schema is not stored and fingerprint(schema) != header.schema:
+            del core._phases['validate']  # the same document, but another schema
+        core._phases['snapshot'] = Phase(started, time.perf_counter() - begin)
+
+        if not lazy:
+            core.validate()
+            core.namespace()
+        return core
+
+    def validate(self) -> None:
+        "Validates the document against the schema, unless it is already done"
+        if 'validate' not in self._phases:
+            self._run('validate', lambda: validate_model(self._source(), self._schema))
+
+    @property
+    def document(self) -> MappingView:
+        "Returns read-only view of the initial (validated) document backed by the compact form ('to_dict()' to copy it)"
+        self.validate()
+        return MappingView(dict(self._fields()))
+
+    @property
+    def index_names(self) -> typing.Tuple[Name, ...]:
+        "Returns names of OpenFOAM models (top level object fields) lookup tables are built for"
+        return tuple(self._get_indexes())
+
+    def index(self, name: Name) -> Index:
+        "Returns precomputed lookup tables for the given OpenFOAM model 'name'"
+        return self._get_indexes()[name]
+
+    def categories(self, name: Name) -> Categories:
         "Extracts 'categories' for the given OpenFOAM model 'name'"
-        return categories(self._document[name])
+        return self._get_indexes()[name].categories
 
-    def models(self, name: Name) -> Models:
+    def models(self, name: Name) -> ModelAttrs:
         "Extracts 'models' for the given OpenFOAM model 'name'"
-        return models(self._document[name])
+        return self._get_indexes()[name].models
+
+    def attrs(self, name: Name, model: Name) -> AttrsTable:
+        "Extracts attributes of the 'model' for the given OpenFOAM model 'name'"
+        return self._get_indexes()[name].attrs(model)
 
     def namespace(self) -> typing.Any:
-        "Returns 'definitions' namespace"
+        "Returns 'definitions' namespace, building it on first access"
+        if self._namespace is None:
+            self._namespace = self._run('namespace', lambda: namespace.build(self._schema, *namespace.CoreOptions))
+
         return self._namespace
+
+    def classes(self) -> Type2Class:
+        "Returns attribute 'type' to 'definitions' namespace class dispatch table ('None' for undefined ones)"
+        if self._classes is None:
+            names: typing.Set[Name] = set()
+            for index in self._get_indexes().values():
+                names.update(index.types)
+            definitions = self.namespace()
+            classes = dict((name, getattr(definitions, name, None)) for name in names)
+            self._classes = types.MappingProxyType(classes)
+
+        return self._classes
+
+    def validate_solver(self, document: JSDocument, schema: JSSchema) -> None:
+        "Validates 'solver' document against this core (without rebuilding the core document)"
+        self.validate()
+        validate(document, schema)
+        assert document['transport'] in self.categories('transport')
+
+    def validate_solvers(self, documents: typing.Iterable[JSDocument], schema: JSSchema) -> typing.List[batch.Result]:
+        "Validates many 'solver' documents against this core, returning per-document results instead of raising"
+        self.validate()
+        return batch.validate_solvers(documents, schema, self.categories('transport'))
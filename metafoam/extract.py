@@ -0,0 +1,101 @@
+"""Defines single pass extraction of OpenFOAM models and their attributes from the sources
+"""
+import argparse
+import concurrent.futures
+import json
+import mmap
+import os
+import re
+import sys
+import typing
+
+from .common import Name, Names
+
+Suffixes = ('.H', '.C')  #: scanned source files
+Lookup = re.compile(rb'^.*lookup\("([^"]*)', re.MULTILINE)  #: last 'lookup("...")' per line (as greedy 'sed' does)
+
+
+class Scan(typing.NamedTuple):
+    "Describes what was found in a single source file"
+    path: str
+    derived: bool  #: the file mentions 'public <base>'
+    lookups: typing.Optional[Names]  #: 'lookup("...")' names (only for '.C' files)
+
+
+class Extraction(typing.NamedTuple):
+    "Describes models derived from the base class and their attributes"
+    models: Names  #: 'foam2models' equivalent, sorted case-insensitively
+    attrs: typing.Dict[Name, Names]  #: 'models2attributes' equivalent, per model sorted case-insensitively and unique
+
+
+def model_name(path: str) -> Name:
+    "Returns model name from the source file name (up to the first dot)"
+    return os.path.basename(path).split('.', 1)[0]
+
+
+def ignore_case(names: typing.Iterable[Name]) -> Names:
+    "Sorts names as 'sort --ignore-case' does"
+    return sorted(names, key=lambda name: (name.upper(), name))
+
+
+def unique(names: Names) -> Names:
+    "Drops adjacent duplicates as 'uniq' does"
+    return [name for index, name in enumerate(names) if index == 0 or names[index - 1] != name]
+
+
+def candidates(root: str, suffixes: typing.Tuple[str, ...] = Suffixes) -> typing.Iterator[str]:
+    "Lists source files in the given tree (walked once, in stable order)"
+    for path, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(suffixes):
+                yield os.path.join(path, name)
+
+
+def scan(path: str, base: str) -> Scan:
+    "Scans the (memory mapped) source file for the base class mention and 'lookup' attributes"
+    with open(path, 'rb') as stream:
+        if os.fstat(stream.fileno()).st_size == 0:
+            return Scan(path, False, [] if path.endswith('.C') else None)
+
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            derived = re.search('public {}'.format(base).encode('utf-8'), data, re.IGNORECASE) is not None
+            lookups = None
+            if path.endswith('.C'):
+                lookups = [] if data.find(b'lookup("') < 0 else [
+                    match.group(1).decode('utf-8', 'replace') for match in Lookup.finditer(data)
+                ]
+
+    return Scan(path, derived, lookups)
+
+
+def extract(
+    root: str, base: str = 'viscosityModel', jobs: typing.Optional[int] = None, processes: bool = False
+) -> Extraction:
+    "Extracts models derived from the base class and their 'lookup' attributes, scanning each source file once"
+    paths = list(candidates(root))
+    executor = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+    with executor(jobs) as pool:
+        scans = list(pool.map(scan, paths, [base] * len(paths)))
+
+    lookups = dict((model_name(item.path), item.lookups) for item in scans if item.lookups is not None)
+    models = ignore_case(model_name(item.path) for item in scans if item.derived)
+
+    return Extraction(models, dict((model, unique(ignore_case(lookups[model]))) for model in models if model in lookups))
+
+
+def arguments(parser: argparse.ArgumentParser) -> None:
+    "Defines 'extract' command line arguments"
+    parser.add_argument('foam', help='OpenFOAM sources checkout')
+    parser.add_argument('--models-dir', default=os.path.join('src', 'transportModels'), help='(default: %(default)s)')
+    parser.add_argument('--base', default='viscosityModel', help='models base class (default: %(default)s)')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='workers (default: per CPU count)')
+    parser.add_argument('--processes', action='store_true', help='scan in processes instead of threads')
+    parser.set_defaults(run=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    "Runs 'extract' command, writing models and attributes as JSON"
+    result = extract(os.path.join(args.foam, args.models_dir), args.base, args.jobs, args.processes)
+    sys.stdout.write(json.dumps(result._asdict(), indent=2) + '\n')
+    return 0
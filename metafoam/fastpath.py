@@ -0,0 +1,251 @@
+"""Defines generated fast-path validation of OpenFOAM metamodel documents
+
+A (compiled, see 'common.compile_schema') schema using only 'Keywords' is turned into Python source of a predicate
+telling valid documents apart; rejected documents are passed on to 'jsonschema' to build detailed errors, while schemas
+using anything else are left to 'jsonschema' entirely.
+"""
+import typing
+
+Keywords = {
+    'type', 'properties', 'required', 'additionalProperties', 'minProperties', 'maxProperties',
+    'items', 'additionalItems', 'oneOf', 'uniqueItems', '$ref',
+}  #: supported validation keywords
+Annotations = {'title', 'description', '$schema', '$comment', 'definitions', 'default', 'examples'}  #: ignored keywords
+Drafts = (
+    None, 'http://json-schema.org/draft-06/schema', 'http://json-schema.org/draft-07/schema',
+)  #: supported '$schema' values (with the same 'integer' semantics as the default 'jsonschema' validator)
+Types = {
+    'object': 'isinstance({0}, dict)',
+    'array': 'isinstance({0}, list)',
+    'string': 'isinstance({0}, str)',
+    'boolean': 'isinstance({0}, bool)',
+    'null': '{0} is None',
+    'number': '(isinstance({0}, (int, float)) and not isinstance({0}, bool))',
+    'integer': '_integer({0})',
+}  #: 'type' checks by name
+
+Predicate = typing.Callable[[typing.Any], bool]  #: typedef on generated validation function
+
+
+class _Unsupported(Exception):
+    "Signals schema the fast path can not be generated for"
+
+
+class _Bool:  # pylint: disable=too-few-public-methods
+    "Tells 'true'/'false' items apart from '1'/'0' ones (as 'jsonschema' does for 'uniqueItems')"
+
+
+def _integer(value: typing.Any) -> bool:
+    "Checks 'integer' type the way draft 6/7 do (floats with no fractional part included)"
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or isinstance(value, float) and value.is_integer()
+
+
+def _freeze(value: typing.Any) -> typing.Hashable:
+    "Returns hashable equivalent of the given JSON value"
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return typing.cast(typing.Hashable, value)
+
+
+def _unique(items: typing.List[typing.Any]) -> bool:
+    "Checks 'uniqueItems' in linear time"
+    keys = set((_Bool, item) if isinstance(item, bool) else _freeze(item) for item in items)
+    return len(keys) == len(items)
+
+
+Helpers = {'_integer': _integer, '_unique': _unique}  #: functions generated source refers to
+
+
+class _Generator:
+    "Generates one validation function per distinct subschema"
+    __slots__ = ('_root', '_names', '_keep', '_sources', '_constants', '_tables')
+
+    def __init__(self, root: typing.Dict[str, typing.Any]):
+        self._root = root
+        self._names: typing.Dict[int, str] = {}
+        self._keep: typing.List[typing.Any] = []  # keeps subschema 'id's unique
+        self._sources: typing.List[str] = []
+        self._constants: typing.List[str] = []
+        self._tables: typing.List[str] = []
+
+    @property
+    def source(self) -> str:
+        "Returns generated module source"
+        constants, tables = (''.join(line + '\n' for line in lines) for lines in (self._constants, self._tables))
+        return constants + '\n\n'.join(self._sources) + '\n\n' + tables + 'validate = _v0\n'
+
+    def _constant(self, value: typing.Any) -> str:
+        "Returns name of module level constant (so that it is not rebuilt on every call)"
+        name = '_c{}'.format(len(self._constants))
+        self._constants.append('{} = {!r}'.format(name, value))
+        return name
+
+    def _table(self, functions: typing.Dict[str, str]) -> str:
+        "Returns name of module level 'property' to function mapping (defined once all the functions are)"
+        name = '_t{}'.format(len(self._tables))
+        self._tables.append('{} = {{{}}}'.format(name, ', '.join('{!r}: {}'.format(*item) for item in functions.items())))
+        return name
+
+    def function(self, schema: typing.Any) -> str:
+        "Returns name of the function validating against the given subschema, generating it on first request"
+        name = self._names.get(id(schema))
+        if name is None:
+            name = self._names[id(schema)] = '_v{}'.format(len(self._names))
+            self._keep.append(schema)
+            self._sources.append('def {}(data):\n{}'.format(name, '\n'.join(self._body(schema))))
+        return name
+
+    def _ref(self, pointer: typing.Any) -> str:
+        "Returns function name for the given (recursive definition) reference"
+        prefix = '#/definitions/'
+        if not isinstance(pointer, str) or not pointer.startswith(prefix) or '/' in pointer[len(prefix):]:
+            raise _Unsupported(pointer)
+        name = pointer[len(prefix):].replace('~1', '/').replace('~0', '~')
+        definitions = self._root.get('definitions', {})
+        if name not in definitions:
+            raise _Unsupported(pointer)
+        return self.function(definitions[name])
+
+    def _body(self, schema: typing.Any) -> typing.List[str]:
+        "Generates function body lines"
+        if isinstance(schema, bool):
+            return ['    return {!r}'.format(schema)]
+        if not isinstance(schema, dict) or not set(schema) <= Keywords | Annotations:
+            raise _Unsupported(schema)
+        if '$ref' in schema:
+            return ['    return {}(data)'.format(self._ref(schema['$ref']))]  # siblings are ignored by draft 6/7
+
+        lines = []
+        if 'type' in schema:
+            types = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+            if not all(isinstance(typ, str) and typ in Types for typ in types):
+                raise _Unsupported(types)
+            lines.append('    if not ({}):'.format(' or '.join(Types[typ].format('data') for typ in types) or 'False'))
+            lines.append('        return False')
+
+        lines.extend(self._object(schema))
+        lines.extend(self._array(schema))
+
+        if 'oneOf' in schema:
+            if not isinstance(schema['oneOf'], list) or not schema['oneOf']:
+                raise _Unsupported(schema['oneOf'])
+            calls = ' + '.join('{}(data)'.format(self.function(item)) for item in schema['oneOf'])
+            lines.append('    if {} != 1:'.format(calls))
+            lines.append('        return False')
+
+        lines.append('    return True')
+        return lines
+
+    def _object(self, schema: typing.Dict[str, typing.Any]) -> typing.List[str]:
+        "Generates 'object' keywords checks"
+        lines = []
+        for name in schema.get('required', ()):
+            lines.append('        if {!r} not in data:'.format(name))
+            lines.append('            return False')
+
+        for keyword, check in (('minProperties', '<'), ('maxProperties', '>')):
+            if keyword in schema:
+                lines.append('        if len(data) {} {!r}:'.format(check, schema[keyword]))
+                lines.append('            return False')
+
+        properties = schema.get('properties', {})
+        additional = schema.get('additionalProperties', True)
+        if additional is False:  # dispatches by key, whatever the number of properties is
+            table = self._table(dict((name, self.function(item)) for name, item in properties.items()))
+            lines.append('        for key, value in data.items():')
+            lines.append('            check = {}.get(key)'.format(table))
+            lines.append('            if check is None or not check(value):')
+            lines.append('                return False')
+            return ['    if isinstance(data, dict):'] + lines
+
+        for name, item in properties.items():
+            lines.append('        if {0!r} in data and not {1}(data[{0!r}]):'.format(name, self.function(item)))
+            lines.append('            return False')
+
+        if additional is not True:
+            known = self._constant(frozenset(properties))
+            lines.append('        for key, value in data.items():')
+            lines.append('            if key not in {} and not {}(value):'.format(known, self.function(additional)))
+            lines.append('                return False')
+
+        return ['    if isinstance(data, dict):'] + lines if lines else []
+
+    def _array(self, schema: typing.Dict[str, typing.Any]) -> typing.List[str]:
+        "Generates 'array' keywords checks"
+        lines = []
+        items = schema.get('items', True)
+        if isinstance(items, list):
+            for index, item in enumerate(items):
+                lines.append('        if len(data) > {0} and not {1}(data[{0}]):'.format(index, self.function(item)))
+                lines.append('            return False')
+            additional = schema.get('additionalItems', True)
+            if additional is False:
+                lines.append('        if len(data) > {}:'.format(len(items)))
+                lines.append('            return False')
+            elif additional is not True:
+                lines.append('        for item in data[{}:]:'.format(len(items)))
+                lines.append('            if not {}(item):'.format(self.function(additional)))
+                lines.append('                return False')
+        elif items is not True:
+            lines.append('        for item in data:')
+            lines.append('            if not {}(item):'.format(self.function(items)))
+            lines.append('                return False')
+
+        if schema.get('uniqueItems', False):
+            lines.append('        if not _unique(data):')
+            lines.append('            return False')
+
+        return ['    if isinstance(data, list):'] + lines if lines else []
+
+
+def generate(schema: typing.Dict[str, typing.Any]) -> typing.Optional[str]:
+    "Generates module source defining 'validate' predicate for the given schema ('None' if not supported)"
+    draft = schema.get('$schema')
+    if (draft.rstrip('#') if isinstance(draft, str) else draft) not in Drafts:
+        return None
+
+    generator = _Generator(schema)
+    try:
+        generator.function(schema)
+    except _Unsupported:
+        return None
+    return generator.source
+
+
+def predicate(schema: typing.Dict[str, typing.Any]) -> typing.Optional[Predicate]:
+    "Returns generated validation function for the given schema ('None' if not supported)"
+    source = generate(schema)
+    if source is None:
+        return None
+
+    namespace = dict(Helpers)
+    exec(compile(source, '<metafoam.fastpath>', 'exec'), namespace)  # pylint: disable=exec-used
+    return typing.cast(Predicate, namespace['validate'])
+
+
+class Validator:
+    "Accepts documents with the generated predicate, leaving rejected ones to 'jsonschema' validator (for errors)"
+    __slots__ = ('_predicate', '_fallback')
+
+    def __init__(self, check: Predicate, fallback: typing.Any):
+        self._predicate = check
+        self._fallback = fallback
+
+    @property
+    def schema(self) -> typing.Any:
+        "Returns (compiled) schema"
+        return self._fallback.schema
+
+    def is_valid(self, instance: typing.Any) -> bool:
+        "Tells whether the instance is valid"
+        return self._predicate(instance) or self._fallback.is_valid(instance)
+
+    def iter_errors(self, instance: typing.Any) -> typing.Iterator[typing.Any]:
+        "Yields validation errors (computed by 'jsonschema' only once the fast path rejects the instance)"
+        if self._predicate(instance):
+            return iter(())
+        return typing.cast(typing.Iterator[typing.Any], self._fallback.iter_errors(instance))
@@ -0,0 +1,73 @@
+"""Defines incremental re-validation of OpenFOAM 'solver' documents
+"""
+import typing
+
+from .common import JSDocument, JSSchema, Name
+from .common import check, validate, validator, pointer2schema, descend, resolve
+from .core import Core
+
+Path = typing.Tuple[typing.Union[Name, int], ...]  #: typedef on path to a value inside JSON document
+Semantic = typing.Callable[[JSDocument, Core], None]  #: typedef on semantic check of a 'solver' document part
+
+
+def check_transport(document: JSDocument, core: Core) -> None:
+    "Checks that solver 'transport' refers to a core 'transport/categories' entry"
+    assert document['transport'] in core.categories('transport')
+
+
+Semantics: typing.Dict[Name, Semantic] = {'transport': check_transport}  #: semantic checks per top-level property
+Local = {
+    'type', 'properties', 'required', 'additionalProperties', 'title', 'description', '$comment', 'default', 'examples',
+}  #: entity keywords which let an existing property be checked alone (anything else needs the whole document)
+
+
+class Tracker:
+    "Tracks modified top-level properties of a 'solver' document to re-validate only them"
+    __slots__ = ('_document', '_schema', '_core', '_entity', '_properties', '_validators', '_dirty')
+
+    def __init__(self, document: JSDocument, schema: JSSchema, core: Core):
+        self._document = document
+        self._schema = schema
+        self._core = core
+
+        self._entity = descend(schema, schema['properties']['entry']['$ref'])
+        definition = resolve(schema, self._entity)
+        local = isinstance(definition, dict) and set(definition) <= Local
+        self._properties: typing.FrozenSet[Name] = frozenset(definition.get('properties', {}) if local else ())
+
+        self._validators: typing.Dict[Name, typing.Any] = {}
+        self._dirty: typing.Set[Name] = set()
+
+    @property
+    def dirty(self) -> typing.FrozenSet[Name]:
+        "Returns modified (not re-validated yet) top-level properties"
+        return frozenset(self._dirty)
+
+    def mark(self, path: Path) -> None:
+        "Marks the given document path as modified"
+        assert path, path
+        self._dirty.add(str(path[0]))
+
+    def _validator(self, key: Name) -> typing.Any:
+        "Returns compiled validator of the given top-level property subschema"
+        if key not in self._validators:
+            self._validators[key] = validator(pointer2schema(self._schema, descend(self._schema, self._entity, key)))
+
+        return self._validators[key]
+
+    def revalidate(self) -> None:
+        "Re-validates modified parts of the document (the whole one if some of them can not be checked alone)"
+        document = self._document
+        dirty = sorted(self._dirty)
+
+        if any(key not in self._properties or key not in document for key in dirty):
+            validate(document, self._schema)  # 'required', 'additionalProperties' or entity keywords might be affected
+        else:
+            for key in dirty:
+                check(document[key], self._validator(key))
+
+        for key in dirty:
+            if key in document and key in Semantics:
+                Semantics[key](document, self._core)
+
+        self._dirty.clear()
@@ -0,0 +1,70 @@
+"""Defines precomputed read-only lookup tables for OpenFOAM metamodel
+"""
+import types
+import typing
+
+from .common import JSDocument, Name, Type, Value
+from .store import AttrRecords, AttrsTable, Store
+
+Categories = typing.Mapping[Name, typing.Tuple[Name, ...]]  #: typedef on read-only 'category' to 'models' mapping
+ModelAttrs = typing.Mapping[Name, AttrRecords]  #: typedef on read-only 'model' to 'attrs' mapping
+
+
+class AttrClass(typing.NamedTuple):
+    "Describes 'attribute' by its namespace class and default 'value'"
+    cls: typing.Any
+    value: Value
+
+
+ClassesTable = typing.Mapping[Name, AttrClass]  #: typedef on read-only attribute 'name' to 'class'/'value' mapping
+Type2Class = typing.Mapping[Type, typing.Any]  #: typedef on read-only attribute 'type' to namespace class mapping
+
+
+class Index:
+    "Provides precomputed lookup tables for the given OpenFOAM model (e.g. 'transport') description"
+    __slots__ = ('_store', '_categories', '_models', '_attrs', '_types')
+
+    def __init__(self, model: typing.Union[JSDocument, Store]):
+        store = model if isinstance(model, Store) else Store(model)
+        self._setup(store, dict(store.categories), dict((item.name, item.attrs or ()) for item in store.models))
+
+    def _setup(self, store: Store, categories: typing.Dict[Name, typing.Tuple[Name, ...]],
+               models: typing.Dict[Name, AttrRecords]) -> None:
+        "Builds the tables from 'category' to 'models' and 'model' to 'attrs' mappings"
+        self._store = store
+        self._categories: Categories = types.MappingProxyType(categories)
+        self._models: ModelAttrs = types.MappingProxyType(models)
+        self._attrs: typing.Mapping[Name, AttrsTable] = types.MappingProxyType(
+            dict((name, store.pool.table(attrs)) for name, attrs in models.items())
+        )
+        self._types = frozenset(record.type for table in self._attrs.values() for record in table.values())
+
+    def __getstate__(self) -> typing.Tuple[typing.Any, ...]:
+        return (self._store, dict(self._categories), dict(self._models))
+
+    def __setstate__(self, state: typing.Tuple[typing.Any, ...]) -> None:
+        self._setup(*state)
+
+    @property
+    def store(self) -> Store:
+        "Returns compact description the tables are built on"
+        return self._store
+
+    @property
+    def categories(self) -> Categories:
+        "Returns 'category' to 'models' mapping"
+        return self._categories
+
+    @property
+    def models(self) -> ModelAttrs:
+        "Returns 'model' to 'attrs' mapping"
+        return self._models
+
+    @property
+    def types(self) -> typing.FrozenSet[Type]:
+        "Returns all attribute 'types' in use"
+        return self._types
+
+    def attrs(self, model: Name) -> AttrsTable:
+        "Returns attribute 'name' to 'type'/'value' mapping for the given 'model'"
+        return self._attrs[model]
@@ -0,0 +1,138 @@
+"""Defines lightweight instrumentation hooks for OpenFOAM metamodel phases
+"""
+import contextlib
+import json
+import threading
+import time
+import typing
+
+
+class Event(typing.NamedTuple):
+    "Describes a timed phase ('span') or a counter increment ('count')"
+    kind: str
+    name: str
+    value: float  #: seconds for 'span', increment for 'count'
+
+
+Hook = typing.Callable[[Event], None]  #: typedef on event consumer
+
+Hooks: typing.List[Hook] = []  #: subscribed event consumers (instrumentation is disabled while empty)
+
+
+def subscribe(hook: Hook) -> None:
+    "Starts delivering events to the given consumer"
+    Hooks.append(hook)
+
+
+def unsubscribe(hook: Hook) -> None:
+    "Stops delivering events to the given consumer"
+    if hook in Hooks:
+        Hooks.remove(hook)
+
+
+@contextlib.contextmanager
+def hooked(hook: Hook) -> typing.Iterator[Hook]:
+    "Delivers events to the given consumer within the block"
+    subscribe(hook)
+    try:
+        yield hook
+    finally:
+        unsubscribe(hook)
+
+
+def emit(event: Event) -> None:
+    "Delivers the event to all the consumers"
+    for hook in list(Hooks):
+        hook(event)
+
+
+def count(name: str, value: float = 1) -> None:
+    "Emits counter increment (no-op while disabled)"
+    if Hooks:
+        emit(Event('count', name, value))
+
+
+class _Span:
+    "Times the block and emits corresponding 'span' event"
+    __slots__ = ('_name', '_started')
+
+    def __init__(self, name: str):
+        self._name = name
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *args: typing.Any) -> None:
+        emit(Event('span', self._name, time.perf_counter() - self._started))
+
+
+class _Null:
+    "Does nothing (shared while instrumentation is disabled)"
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *args: typing.Any) -> None:
+        pass
+
+
+Null = _Null()  #: shared disabled span
+
+
+def span(name: str) -> typing.Union[_Span, _Null]:
+    "Returns context manager timing the block (no-op while disabled)"
+    return _Span(name) if Hooks else Null
+
+
+class Stats(typing.NamedTuple):
+    "Describes aggregated events of the same name"
+    calls: int  #: number of events
+    total: float  #: total seconds (or increments)
+    min: float
+    max: float
+
+
+class Aggregator:
+    "Aggregates events in memory"
+    __slots__ = ('_stats', '_lock')
+
+    def __init__(self) -> None:
+        self._stats: typing.Dict[typing.Tuple[str, str], Stats] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        key = (event.kind, event.name)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                self._stats[key] = Stats(1, event.value, event.value, event.value)
+            else:
+                self._stats[key] = Stats(
+                    stats.calls + 1, stats.total + event.value, min(stats.min, event.value), max(stats.max, event.value)
+                )
+
+    def stats(self, kind: str = 'span') -> typing.Dict[str, Stats]:
+        "Returns aggregated events of the given kind by name"
+        with self._lock:
+            return dict((name, stats) for (typ, name), stats in self._stats.items() if typ == kind)
+
+    def reset(self) -> None:
+        "Drops aggregated events"
+        with self._lock:
+            self._stats.clear()
+
+
+class JSONLines:  # pylint: disable=too-few-public-methods
+    "Writes events as JSON lines to the given text stream"
+    __slots__ = ('_stream', '_lock')
+
+    def __init__(self, stream: typing.TextIO):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        record = dict(event._asdict(), time=time.time())
+        with self._lock:
+            self._stream.write(json.dumps(record) + '\n')
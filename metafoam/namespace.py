@@ -0,0 +1,96 @@
+"""Defines shared 'definitions' namespaces for OpenFOAM metamodel
+"""
+import types
+import typing
+
+from .common import JSSchema
+from .cache import LRUCache, CacheInfo, fingerprint
+from . import instrument
+
+Options = typing.Tuple[bool, bool, bool]  #: typedef on 'strict', 'named_only' and 'standardize_names' build options
+NamespaceKey = typing.Tuple[str, bool, bool, bool]  #: typedef on namespace cache key
+
+CoreOptions: Options = (True, False, False)  #: build options used by 'Core'
+
+Namespaces: LRUCache[NamespaceKey, typing.Any] = LRUCache(maxsize=32)  #: namespaces keyed by schema hash and options
+Modules: typing.Dict[NamespaceKey, types.ModuleType] = {}  #: generated modules keyed by schema hash and options
+
+
+class Generated:
+    "Provides 'definitions' namespace backed by a generated module with 'python_jsonschema_objects' fallback"
+    __slots__ = ('_module', '_schema')
+
+    def __init__(self, module: types.ModuleType, schema: JSSchema):
+        self._module = module
+        self._schema = schema
+
+    def __getattr__(self, name: str) -> typing.Any:
+        classes = self._module.CLASSES
+        if name in classes:
+            return classes[name]
+
+        strict, named_only, standardize_names = self._module.OPTIONS
+        return getattr(_build(self._schema, strict, named_only, standardize_names), name)
+
+    @property
+    def module(self) -> types.ModuleType:
+        "Returns underlying generated module"
+        return self._module
+
+
+def _build(schema: JSSchema, strict: bool, named_only: bool, standardize_names: bool) -> typing.Any:
+    "Returns (shared) 'python_jsonschema_objects' namespace for the given schema"
+    key = (fingerprint(schema), strict, named_only, standardize_names)
+
+    def factory() -> typing.Any:
+        import python_jsonschema_objects as pjs  # pylint: disable=import-outside-toplevel
+
+        with instrument.span('build_classes'):
+            builder = pjs.ObjectBuilder(schema)
+            return builder.build_classes(strict=strict, named_only=named_only, standardize_names=standardize_names)
+
+    return Namespaces.get(key, factory)
+
+
+def build(schema: JSSchema, strict: bool = True, named_only: bool = False, standardize_names: bool = False) -> typing.Any:
+    "Returns (shared) 'definitions' namespace for the given schema, preferring registered generated module"
+    key = (fingerprint(schema), strict, named_only, standardize_names)
+    if key in Modules:
+        return Generated(Modules[key], schema)
+
+    return _build(schema, strict, named_only, standardize_names)
+
+
+def register(module: types.ModuleType) -> None:
+    "Registers generated module (see 'metafoam.codegen') to be used for matching schemas"
+    strict, named_only, standardize_names = module.OPTIONS
+    Modules[(module.SCHEMA_HASH, strict, named_only, standardize_names)] = module
+
+
+def unregister(module: types.ModuleType) -> None:
+    "Cancels generated module registration"
+    strict, named_only, standardize_names = module.OPTIONS
+    Modules.pop((module.SCHEMA_HASH, strict, named_only, standardize_names), None)
+
+
+def invalidate(schema: typing.Optional[JSSchema] = None) -> None:
+    "Drops namespaces built for the given schema (all of them if no schema is given)"
+    if schema is None:
+        Namespaces.clear()
+        return
+
+    digest = fingerprint(schema)
+    for strict in (False, True):
+        for named_only in (False, True):
+            for standardize_names in (False, True):
+                Namespaces.discard((digest, strict, named_only, standardize_names))
+
+
+def resize(maxsize: int) -> None:
+    "Changes the number of namespaces to be kept"
+    Namespaces.resize(maxsize)
+
+
+def info() -> CacheInfo:
+    "Returns namespaces cache statistics"
+    return Namespaces.info()
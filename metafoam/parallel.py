@@ -0,0 +1,191 @@
+"""Defines multi-process validation of OpenFOAM 'core'/'solver' document trees
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import typing
+
+from .common import JSDocument, JSSchema, Name
+from .common import definition2schema, validate_model, validator
+from .core import Core
+from .results import Directory, configure, configured
+from . import batch
+
+Record = typing.Dict[str, typing.Any]  #: typedef on a single validation outcome (JSON line)
+
+Errors = (AssertionError, KeyError, TypeError, ValueError, OSError)  #: reported setup errors (besides 'jsonschema' ones)
+
+
+def load(path: str) -> typing.Any:
+    "Loads JSON document from the given file"
+    with open(path, encoding='utf-8') as stream:
+        return json.load(stream)
+
+
+def load_schema(path: str, entity: Name) -> JSSchema:
+    "Loads schema and composes its 'run-time' form for the given entity, if needed"
+    schema: JSSchema = load(path)
+    if 'entry' not in schema.get('properties', {}):
+        definition2schema(schema, entity)
+    return schema
+
+
+def walk(paths: typing.Iterable[str]) -> typing.Iterator[str]:
+    "Lists JSON documents in the given files and directory trees"
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith('.json'):
+                    yield os.path.join(root, name)
+
+
+def describe(error: Exception) -> str:
+    "Describes the given error in one line"
+    message = str(error).splitlines()[0] if str(error) else ''
+    return '{}: {}'.format(type(error).__name__, message) if message else type(error).__name__
+
+
+def is_core(document: typing.Any) -> bool:
+    "Tells 'core' documents (with 'transport' description) apart from 'solver' ones (referring to a category)"
+    return isinstance(document, dict) and isinstance(document.get('transport'), dict)
+
+
+class Context:  # pylint: disable=too-few-public-methods
+    "Keeps warmed up 'Core' and compiled 'solver' validator for validating many documents"
+    __slots__ = ('_core', '_core_schema', '_solver', '_categories')
+
+    def __init__(self, core_document: JSDocument, core_schema: JSSchema, solver_schema: JSSchema):
+        self._core = Core(core_document, core_schema, lazy=True)  # validated by 'prepare' (only indexes are needed)
+        self._core_schema = core_schema
+        self._solver = validator(solver_schema)
+        self._categories = self._core.categories('transport')
+
+    def _validate(self, path: str) -> Record:
+        "Validates single document"
+        kind = None
+        error: typing.Optional[Exception] = None
+        started = time.perf_counter()
+        try:
+            document = load(path)
+            if is_core(document):
+                kind = 'core'
+                validate_model(document, self._core_schema)
+            else:
+                kind = 'solver'
+                error = batch.validate_solver(document, self._solver, self._categories).error
+        except Exception as exception:  # pylint: disable=broad-exception-caught  # one document never aborts the run
+            error = exception
+
+        return {
+            'path': path,
+            'kind': kind,
+            'valid': error is None,
+            'error': None if error is None else describe(error),
+            'elapsed': time.perf_counter() - started,
+        }
+
+    def validate(self, paths: typing.Iterable[str]) -> typing.List[Record]:
+        "Validates the given documents"
+        return [self._validate(path) for path in paths]
+
+
+Contexts: typing.Dict[str, Context] = {}  #: per process warmed up context
+
+
+def _initialize(core_document: JSDocument, core_schema: JSSchema, solver_schema: JSSchema, cache: typing.Optional[str]) -> None:
+    "Warms up per process validation context (with already loaded and validated core and schemas)"
+    configure(cache)
+    Contexts['worker'] = Context(core_document, core_schema, solver_schema)
+
+
+def _validate(paths: typing.List[str]) -> typing.List[Record]:
+    "Validates chunk of documents in the warmed up context"
+    return Contexts['worker'].validate(paths)
+
+
+def chunks(items: typing.List[str], size: int) -> typing.List[typing.List[str]]:
+    "Splits the given list into chunks of the given size"
+    return [items[index:index + size] for index in range(0, len(items), size)]
+
+
+def positive(text: str) -> int:
+    "Parses positive integer command line argument"
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError('{!r} is not a positive number'.format(text))
+    return value
+
+
+def arguments(parser: argparse.ArgumentParser) -> None:
+    "Defines 'validate' command line arguments"
+    parser.add_argument('paths', nargs='+', help='JSON documents or directories to walk')
+    parser.add_argument('--core', required=True, help="'core' document solver documents are checked against")
+    parser.add_argument('--core-schema', required=True, help="'core' schema file")
+    parser.add_argument('--solver-schema', required=True, help="'solver' schema file")
+    parser.add_argument('--core-entity', default='core', help="'core' schema entry definition (default: %(default)s)")
+    parser.add_argument('--solver-entity', default='solver', help="'solver' schema entry definition (default: %(default)s)")
+    parser.add_argument(
+        '--jobs', '-j', type=positive, default=os.cpu_count() or 1, help='worker processes (default: %(default)s)'
+    )
+    parser.add_argument('--chunk-size', type=positive, default=64, help='documents per work item (default: %(default)s)')
+    parser.add_argument('--cache', help='directory to record successful validations in (default: ${})'.format(Directory))
+    parser.add_argument('--no-cache', action='store_true', help='bypass validation results cache')
+    parser.set_defaults(run=run)
+
+
+def report(results: typing.Iterable[typing.List[Record]]) -> typing.Tuple[int, int]:
+    "Writes validation records as JSON lines, returns total and invalid documents count"
+    total = invalid = 0
+    for records in results:
+        for record in records:
+            total += 1
+            invalid += not record['valid']
+            sys.stdout.write(json.dumps(record) + '\n')
+        sys.stdout.flush()
+
+    return total, invalid
+
+
+def prepare(args: argparse.Namespace) -> typing.Tuple[JSDocument, JSSchema, JSSchema]:
+    "Loads and validates 'core' document and schemas once, before any worker starts"
+    core_document = load(args.core)
+    core_schema = load_schema(args.core_schema, args.core_entity)
+    solver_schema = load_schema(args.solver_schema, args.solver_entity)
+    Core(core_document, core_schema, lazy=True).validate()
+    validator(solver_schema)
+    return core_document, core_schema, solver_schema
+
+
+def run(args: argparse.Namespace) -> int:
+    "Runs 'validate' command, streaming results as JSON lines"
+    import jsonschema as js  # pylint: disable=import-outside-toplevel
+
+    started = time.perf_counter()
+    cache = '' if args.no_cache else args.cache
+    with configured(cache):
+        try:
+            initargs = prepare(args) + (cache,)
+        except (js.exceptions.ValidationError, js.exceptions.SchemaError, js.exceptions.RefResolutionError) + Errors as error:
+            sys.stderr.write('metafoam validate: {}\n'.format(describe(error)))
+            return 2
+
+        work = chunks(list(walk(args.paths)), args.chunk_size)
+        if args.jobs == 1:
+            _initialize(*initargs)
+            total, invalid = report(map(_validate, work))
+        else:
+            with multiprocessing.Pool(args.jobs, _initialize, initargs) as pool:
+                total, invalid = report(pool.imap_unordered(_validate, work))
+
+    summary = {'total': total, 'valid': total - invalid, 'invalid': invalid, 'jobs': args.jobs}
+    summary['elapsed'] = time.perf_counter() - started
+    sys.stdout.write(json.dumps(summary) + '\n')
+    return 1 if invalid else 0
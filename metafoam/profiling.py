@@ -0,0 +1,79 @@
+"""Defines profiling entry point for an OpenFOAM core/solver pair
+"""
+import argparse
+import contextlib
+import cProfile
+import pstats
+import sys
+import typing
+
+from .common import JSDocument, JSSchema, Name
+from .core import Core
+from .solver import Solver
+from .parallel import load, load_schema
+from . import instrument
+
+
+def exercise(core_document: JSDocument, core_schema: JSSchema, solver_document: JSDocument, solver_schema: JSSchema) -> int:
+    "Builds core and solver, instantiating every attribute of every model of the solver category; returns their number"
+    core = Core(core_document, core_schema)
+    transport = Solver(solver_document, solver_schema, core).transport
+
+    instances = 0
+    for model in core.categories('transport')[transport.category]:
+        transport.model = model
+        for name in transport.attrs:
+            try:
+                transport.attr(name)
+            except AttributeError:
+                continue  # attribute type is not defined in the 'definitions' namespace
+            instances += 1
+    return instances
+
+
+def profile(
+    core_document: JSDocument, core_schema: JSSchema, solver_document: JSDocument, solver_schema: JSSchema
+) -> pstats.Stats:
+    "Runs 'exercise' under 'cProfile'"
+    profiler = cProfile.Profile()
+    profiler.runcall(exercise, core_document, core_schema, solver_document, solver_schema)
+    return pstats.Stats(profiler, stream=sys.stdout)
+
+
+def arguments(parser: argparse.ArgumentParser) -> None:
+    "Defines 'profile' command line arguments"
+    parser.add_argument('--core', required=True, help="'core' document")
+    parser.add_argument('--core-schema', required=True, help="'core' schema file")
+    parser.add_argument('--solver', required=True, help="'solver' document")
+    parser.add_argument('--solver-schema', required=True, help="'solver' schema file")
+    parser.add_argument('--core-entity', default='core', help="'core' schema entry definition (default: %(default)s)")
+    parser.add_argument('--solver-entity', default='solver', help="'solver' schema entry definition (default: %(default)s)")
+    parser.add_argument('--sort', default='cumulative', help='statistics order (default: %(default)s)')
+    parser.add_argument('--limit', type=int, default=25, help='printed functions (default: %(default)s)')
+    parser.add_argument('--output', help="file to dump 'cProfile' statistics to")
+    parser.add_argument('--events', help='file to write instrumentation events to (as JSON lines)')
+    parser.set_defaults(run=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    "Runs 'profile' command, printing 'cProfile' statistics and instrumented phases summary"
+    documents = (
+        load(args.core), load_schema(args.core_schema, args.core_entity),
+        load(args.solver), load_schema(args.solver_schema, args.solver_entity),
+    )
+    aggregator = instrument.Aggregator()
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(instrument.hooked(aggregator))
+        if args.events:
+            stream = stack.enter_context(open(args.events, 'w', encoding='utf-8'))
+            stack.enter_context(instrument.hooked(instrument.JSONLines(stream)))
+        stats = profile(*documents)
+
+    if args.output:
+        stats.dump_stats(args.output)
+    stats.sort_stats(args.sort).print_stats(args.limit)
+
+    phases: typing.Dict[Name, instrument.Stats] = aggregator.stats()
+    for name, item in sorted(phases.items()):
+        sys.stdout.write('{:>16} {:8d} calls {:12.6f} s total {:12.6f} s max\n'.format(name, item.calls, item.total, item.max))
+    return 0
@@ -0,0 +1,64 @@
+"""Defines registry of OpenFOAM cores for many forks/versions sharing identical model definitions
+"""
+import typing
+
+from .common import JSDocument, JSSchema, Name
+from .core import Core
+from .store import Pool, PoolInfo
+
+Forks = typing.FrozenSet[Name]  #: typedef on read-only set of fork names
+Provided = typing.Tuple[Name, Name, typing.Optional[Name]]  #: typedef on OpenFOAM model 'name', 'model' and 'attr'
+
+NoForks: Forks = frozenset()  #: shared empty answer
+
+
+class Registry(typing.Mapping[Name, Core]):
+    "Keeps one 'Core' per OpenFOAM fork, storing identical definitions once and answering cross-fork questions"
+    __slots__ = ('_schema', '_pool', '_cores', '_providers')
+
+    def __init__(self, schema: JSSchema, pool: typing.Optional[Pool] = None):
+        self._schema = schema
+        self._pool = Pool() if pool is None else pool
+        self._cores: typing.Dict[Name, Core] = {}
+        self._providers: typing.Dict[Provided, Forks] = {}
+
+    def __getitem__(self, fork: Name) -> Core:
+        return self._cores[fork]
+
+    def __iter__(self) -> typing.Iterator[Name]:
+        return iter(self._cores)
+
+    def __len__(self) -> int:
+        return len(self._cores)
+
+    @property
+    def pool(self) -> Pool:
+        "Returns pool the definitions are shared through"
+        return self._pool
+
+    def info(self) -> PoolInfo:
+        "Returns numbers of distinct entities kept for all the forks"
+        return self._pool.info()
+
+    def _provide(self, key: Provided, fork: Name) -> None:
+        "Registers the fork as a provider"
+        self._providers[key] = self._providers.get(key, NoForks) | {fork}
+
+    def add(self, fork: Name, document: JSDocument, schema: typing.Optional[JSSchema] = None) -> Core:
+        "Validates and registers 'core' document of the given fork"
+        assert fork not in self._cores, fork
+        core = Core(document, self._schema if schema is None else schema, pool=self._pool)
+
+        for name in core.index_names:
+            index = core.index(name)
+            for model in index.models:
+                self._provide((name, model, None), fork)
+                for attr in index.attrs(model):
+                    self._provide((name, model, attr), fork)
+
+        self._cores[fork] = core
+        return core
+
+    def forks(self, model: Name, attr: typing.Optional[Name] = None, name: Name = 'transport') -> Forks:
+        "Returns forks providing the given 'model' (with the given 'attr', if any)"
+        return self._providers.get((name, model, attr), NoForks)
@@ -0,0 +1,189 @@
+"""Defines opt-in persistent cache of successful OpenFOAM metamodel validations (shared across processes and runs)
+"""
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import typing
+
+from .cache import CacheInfo, fingerprint
+
+Directory = 'METAFOAM_VALIDATION_CACHE'  #: environment variable enabling the cache in the given directory
+Bypass = 'METAFOAM_VALIDATION_CACHE_BYPASS'  #: environment variable disabling the cache (whatever is enabled)
+MaxSize = 4096  #: default number of kept entries
+Slack = 8  #: entries beyond the capacity are pruned once there are more than 1/'Slack' of it (not on every write)
+Suffix = '.valid'  #: entry file name suffix
+
+
+@functools.lru_cache(maxsize=None)
+def version() -> str:
+    "Returns fingerprint of metafoam sources and 'jsonschema' version validation outcomes depend on"
+    import jsonschema as js  # pylint: disable=import-outside-toplevel
+
+    digest = hashlib.sha256(js.__version__.encode('utf-8'))
+    root = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(root)):
+        if name.endswith('.py'):
+            with open(os.path.join(root, name), 'rb') as stream:
+                digest.update(name.encode('utf-8'))
+                digest.update(stream.read())
+    return digest.hexdigest()
+
+
+class Results:
+    "Keeps successful validations as small files named by (document, schema, metafoam version) hash"
+    __slots__ = ('_directory', '_maxsize', '_hits', '_misses', '_lock', '_count')
+
+    def __init__(self, directory: str, maxsize: int = MaxSize):
+        assert maxsize > 0, maxsize
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        self._count: typing.Optional[int] = None  # approximate number of entries (counted on first write)
+
+    @property
+    def directory(self) -> str:
+        "Returns directory the entries are kept in"
+        return self._directory
+
+    @staticmethod
+    def key(document: typing.Any, schema: typing.Any) -> str:
+        "Composes entry key for the given document and schema"
+        text = '{}:{}:{}'.format(fingerprint(document), fingerprint(schema), version())
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, key + Suffix)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            os.utime(self._path(str(key)))  # marks the entry as recently used
+            found = True
+        except OSError:  # missing or not accessible (the cache is only an optimization)
+            found = False
+        with self._lock:
+            self._hits += found
+            self._misses += not found
+        return found
+
+    def add(self, key: str) -> None:
+        "Records successful validation (atomically, so concurrent writers and readers never see partial entries)"
+        import tempfile  # pylint: disable=import-outside-toplevel  # only needed once writing
+
+        try:
+            descriptor, temporary = tempfile.mkstemp(prefix='.entry-', dir=self._directory)
+        except OSError:
+            return  # not writable, so the validation is just not recorded
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as stream:
+                json.dump({'version': version(), 'time': time.time()}, stream)
+            os.replace(temporary, self._path(key))
+        except BaseException as error:
+            with contextlib.suppress(OSError):
+                os.unlink(temporary)
+            if isinstance(error, OSError):
+                return
+            raise
+
+        with contextlib.suppress(OSError):
+            self._added()
+
+    def _added(self) -> None:
+        "Counts written entry, evicting the least recently used ones once the capacity is exceeded by the slack"
+        with self._lock:
+            self._count = len(self._entries()) if self._count is None else self._count + 1
+            if self._count <= self._maxsize + self._maxsize // Slack:
+                return
+        self.evict()
+
+    def _entries(self) -> typing.List[typing.Tuple[float, str]]:
+        "Lists modification time and path of every entry"
+        entries = []
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith(Suffix):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    continue  # evicted by a concurrent writer
+        return entries
+
+    def evict(self) -> int:
+        "Removes the least recently used entries beyond the capacity, returns their number"
+        entries = self._entries()
+        removed = 0
+        for _, path in sorted(entries)[:max(0, len(entries) - self._maxsize)]:
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                continue  # evicted by a concurrent writer
+        with self._lock:
+            self._count = len(entries) - removed
+        return removed
+
+    def clear(self) -> None:
+        "Drops all entries and resets statistics"
+        for _, path in self._entries():
+            os.unlink(path)
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._count = 0
+
+    def info(self) -> CacheInfo:
+        "Returns cache statistics"
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries()))
+
+
+Caches: typing.Dict[str, typing.Optional[Results]] = {}  #: per process cache (under 'active' key, once configured)
+
+
+def enable(directory: str, maxsize: int = MaxSize) -> Results:
+    "Starts recording successful validations in the given directory (and skipping already recorded ones)"
+    result = Caches['active'] = Results(directory, maxsize)
+    return result
+
+
+def disable() -> None:
+    "Stops using the cache (even if enabled through the environment)"
+    Caches['active'] = None
+
+
+def active() -> typing.Optional[Results]:
+    "Returns cache in use ('None' if disabled, bypassed or not configured)"
+    if os.environ.get(Bypass):
+        return None
+    if 'active' not in Caches:
+        directory = os.environ.get(Directory)
+        try:
+            Caches['active'] = Results(directory) if directory else None
+        except OSError:
+            Caches['active'] = None  # can not be created, so validations are not cached
+    return Caches['active']
+
+
+def configure(directory: typing.Optional[str]) -> None:
+    "Enables cache in the given directory ('' disables it, 'None' leaves the configuration as is)"
+    if directory:
+        enable(directory)
+    elif directory is not None:
+        disable()
+
+
+@contextlib.contextmanager
+def configured(directory: typing.Optional[str]) -> typing.Iterator[None]:
+    "Temporarily configures cache (see 'configure'), restoring the previous configuration afterwards"
+    previous = dict(Caches)
+    configure(directory)
+    try:
+        yield
+    finally:
+        Caches.clear()
+        Caches.update(previous)
@@ -0,0 +1,62 @@
+"""Defines binary snapshot format of a fully built OpenFOAM metamodel core
+
+The payload is a plain 'pickle', so loading a snapshot runs whatever code it refers to: only load trusted files.
+"""
+import os
+import pickle
+import struct
+import tempfile
+import typing
+
+Magic = b'MFSNAP02'  #: leading bytes (format version included)
+Layout = struct.Struct('>8s32s32sQ')  #: 'magic', document and schema SHA-256 digests, payload size
+
+
+class Header(typing.NamedTuple):
+    "Describes what a snapshot was built from"
+    document: str  #: document 'fingerprint'
+    schema: str  #: schema 'fingerprint'
+    size: int  #: payload bytes
+
+
+def write(path: str, document: str, schema: str, state: typing.Any) -> None:
+    "Pickles the state built from the given document/schema 'fingerprints' and atomically replaces the file with it"
+    payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    prefix = Layout.pack(Magic, bytes.fromhex(document), bytes.fromhex(schema), len(payload))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(prefix='.snapshot-', dir=directory)
+    try:
+        with os.fdopen(descriptor, 'wb') as stream:
+            stream.write(prefix)
+            stream.write(payload)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def _check(prefix: bytes, size: int, path: str) -> Header:
+    "Unpacks snapshot header, checking it against the file size"
+    if len(prefix) < Layout.size:
+        raise ValueError("'{}' is not a snapshot (too short)".format(path))
+    magic, document, schema, payload = Layout.unpack(prefix)
+    if magic != Magic:
+        raise ValueError("'{}' is not a snapshot (unexpected magic {!r})".format(path, magic))
+    if size != Layout.size + payload:
+        raise ValueError("'{}' is damaged ({} payload bytes instead of {})".format(path, size - Layout.size, payload))
+    return Header(document.hex(), schema.hex(), payload)
+
+
+def header(path: str) -> Header:
+    "Reads snapshot header only (to check whether the snapshot is up to date)"
+    with open(path, 'rb') as stream:
+        return _check(stream.read(Layout.size), os.fstat(stream.fileno()).st_size, path)
+
+
+def read(path: str) -> typing.Tuple[Header, typing.Any]:
+    "Reads (trusted) snapshot, unpickling the state"
+    with open(path, 'rb') as stream:
+        result = _check(stream.read(Layout.size), os.fstat(stream.fileno()).st_size, path)
+        state = pickle.loads(stream.read())
+    return result, state
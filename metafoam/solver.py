@@ -1,21 +1,27 @@
 """Defines Solver metamodel for OpenFOAM
 """
+import types
 import typing
 
 from .common import JSDocument, JSSchema, Name, Names
-from .common import validate_solver, attrs2names
 
 from .core import Core
+from .index import AttrClass, ClassesTable
+from .store import AttrsTable
+from .incremental import Path, Tracker
+from . import instrument
 
 
 class Transport:
     "Provides entry point for 'transport' model management"
-    __slots__ = ('_document', '_model', '_core')
+    __slots__ = ('_document', '_model', '_core', '_table', '_changed')
 
-    def __init__(self, document: JSDocument, core: Core):
+    def __init__(self, document: JSDocument, core: Core, changed: typing.Optional[typing.Callable[[Path], None]] = None):
         self._document = document
         self._model: Name = ''
         self._core = core
+        self._table: typing.Optional[ClassesTable] = None
+        self._changed = changed
 
     @property
     def category(self) -> Name:
@@ -30,6 +36,10 @@ class Transport:
 
         self._document['transport'] = value
         self._model = ''
+        self._table = None
+
+        if self._changed is not None:
+            self._changed(('transport',))
 
     @property
     def model(self) -> Name:
@@ -43,43 +53,87 @@ class Transport:
         assert value in category2models[self.category]
 
         self._model = value
+        self._table = None
+
+    def attr_records(self) -> AttrsTable:
+        "Returns read-only attribute 'name' to compact record mapping"
+        assert self._model != ''
+
+        return self._core.attrs('transport', self._model)
 
     def attrs2names(self) -> JSDocument:
         "Returns 'attrs' repacked"
-        assert self._model != ''
+        return dict((name, {'type': attr.type, 'value': attr.value}) for name, attr in self.attr_records().items())
 
-        model2attrs = self._core.models('transport')
-        attrs = model2attrs[self._model]
+    def attrs2classes(self) -> ClassesTable:
+        "Returns (memoized) 'attrs' repacked with corresponding namespace classes"
+        if self._table is None:
+            classes = self._core.classes()
+            table = dict((name, AttrClass(classes[attr.type], attr.value)) for name, attr in self.attr_records().items())
+            self._table = types.MappingProxyType(table)
 
-        return attrs2names(attrs)
+        return self._table
 
     @property
     def attrs(self) -> Names:
         "Retruns attribute names"
-        names = self.attrs2names().keys()
+        names = self.attrs2classes().keys()
         return list(names)
 
     def attr(self, name: Name) -> typing.Any:
         "Returns particular attibute instance"
-        attr = self.attrs2names()[name]
-        namespace = self._core.namespace()
-        instance = getattr(namespace, attr['type'])(name=name)
-        instance.value = attr['value']
-        return instance
+        with instrument.span('attr'):
+            attr = self.attrs2classes()[name]
+            if attr.cls is None:
+                raise AttributeError("'{}' attribute type is not defined".format(self.attr_records()[name].type))
+
+            instance = attr.cls(name=name)
+            if attr.value is not None:
+                instance.value = attr.value
+            return instance
 
 
-class Solver:  # pylint: disable=too-few-public-methods
+class Solver:
     "Provides semantic level validation and programming API for an OpenFOAM solver"
-    __slots__ = ('_document', '_core', '_transport_model', '_transport')
+    __slots__ = ('_document', '_schema', '_core', '_transport_model', '_transport', '_tracker')
 
-    def __init__(self, document: JSDocument, schema: JSSchema, core: Core):
-        validate_solver(document, schema, core.document)
+    def __init__(self, document: JSDocument, schema: JSSchema, core: Core, incremental: bool = False):
+        core.validate_solver(document, schema)
         self._transport_model: Name = ''
         self._document = document
+        self._schema = schema
         self._core = core
-        self._transport = Transport(document, core)
+        self._tracker = Tracker(document, schema, core) if incremental else None
+        self._transport = Transport(document, core, self._tracker.mark if self._tracker is not None else None)
 
     @property
     def transport(self) -> Transport:
         "Retruns conamed property"
         return self._transport
+
+    @property
+    def dirty(self) -> typing.FrozenSet[Name]:
+        "Returns modified, but not re-validated yet, top-level properties (in 'incremental' mode only)"
+        return self._tracker.dirty if self._tracker is not None else frozenset()
+
+    def update(self, path: Path, value: typing.Any) -> None:
+        "Changes the document value at the given path"
+        assert path, path
+        target: typing.Any = self._document
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+
+        self.mark(path)
+
+    def mark(self, path: Path) -> None:
+        "Marks the given document path as modified (for changes made directly in the document)"
+        if self._tracker is not None:
+            self._tracker.mark(path)
+
+    def validate(self) -> None:
+        "Re-validates the document (only its modified parts in 'incremental' mode)"
+        if self._tracker is not None:
+            self._tracker.revalidate()
+        else:
+            self._core.validate_solver(self._document, self._schema)
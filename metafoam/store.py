@@ -0,0 +1,294 @@
+"""Defines compact in-memory store for OpenFOAM model (e.g. 'transport') descriptions
+"""
+import json
+import sys
+import types
+import typing
+
+from .common import JSDocument, Name, Type, Value, Attr
+from .cache import fingerprint
+
+Fields = ('models', 'categories')  #: OpenFOAM model description fields kept in the compact form
+
+
+class _Missing:  # pylint: disable=too-few-public-methods
+    "Marks attribute without default 'value' (as distinct from 'null' one)"
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'Missing'
+
+    def __reduce__(self) -> str:
+        return 'Missing'  # stays the shared marker once unpickled
+
+
+Missing = _Missing()  #: shared absent 'value' marker
+
+
+def canonical(value: typing.Any) -> typing.Tuple[str, typing.Any]:
+    "Returns hashable type-tagged form of JSON value (telling '1', '1.0' and 'true' as well as '\"[1]\"' and '[1]' apart)"
+    if isinstance(value, (dict, list)):
+        return (type(value).__name__, json.dumps(value, sort_keys=True, default=repr))
+    return (type(value).__name__, value)
+
+
+class TypeTable:
+    "Keeps attribute 'types' interned and shared across all the records"
+    __slots__ = ('_types',)
+
+    def __init__(self) -> None:
+        self._types: typing.Dict[str, Type] = {}
+
+    def intern(self, typ: str) -> Type:
+        "Returns the shared instance of the given 'type' name"
+        result = self._types.get(typ)
+        if result is None:
+            result = self._types[typ] = sys.intern(typ)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __iter__(self) -> typing.Iterator[Type]:
+        return iter(self._types)
+
+
+class AttrRecord:
+    "Describes 'attribute' by its 'name', schema 'type' and default 'value'"
+    __slots__ = ('name', 'type', '_value')
+
+    def __init__(self, name: Name, typ: Type, value: typing.Any = Missing):
+        self.name = name
+        self.type = typ
+        self._value = value
+
+    @property
+    def value(self) -> Value:
+        "Returns default 'value' ('None' if not defined)"
+        return None if self._value is Missing else self._value
+
+    @property
+    def has_value(self) -> bool:
+        "Tells whether default 'value' is defined"
+        return self._value is not Missing
+
+    def to_attr(self) -> Attr:
+        "Rebuilds the original JSON description"
+        body: typing.Dict[str, typing.Any] = {'name': self.name}
+        if self._value is not Missing:
+            body['value'] = self._value
+        return {self.type: body}
+
+    def _key(self) -> typing.Tuple[typing.Any, ...]:
+        return (self.name, self.type, canonical(self._value))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AttrRecord):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return 'AttrRecord({!r}, {!r}, {!r})'.format(self.name, self.type, self._value)
+
+
+AttrRecords = typing.Tuple[AttrRecord, ...]  #: typedef on (ordered) attributes of a model
+AttrsTable = typing.Mapping[Name, AttrRecord]  #: typedef on read-only attribute 'name' to 'type'/'value' mapping
+
+Empty: AttrsTable = types.MappingProxyType({})  #: shared empty attributes table
+
+
+class ModelRecord:  # pylint: disable=too-few-public-methods
+    "Describes 'model' by its 'name' and 'attrs' ('None' if not given), keeping other (rare) fields as is"
+    __slots__ = ('name', 'attrs', 'extra')
+
+    def __init__(self, name: Name, attrs: typing.Optional[AttrRecords], extra: typing.Optional[JSDocument] = None):
+        self.name = name
+        self.attrs = attrs
+        self.extra = extra
+
+    def _key(self) -> typing.Tuple[typing.Any, ...]:
+        return (self.name, self.attrs, fingerprint(self.extra) if self.extra else None)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ModelRecord):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def to_model(self) -> JSDocument:
+        "Rebuilds the original JSON description"
+        result: typing.Dict[str, typing.Any] = {'name': self.name}
+        if self.attrs is not None:
+            result['attrs'] = [record.to_attr() for record in self.attrs]
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+
+class PoolInfo(typing.NamedTuple):
+    "Describes how many distinct entities are kept in a 'Pool'"
+    types: int
+    attrs: int
+    models: int
+    tables: int
+
+
+class Pool:
+    "Keeps attribute types, records, model definitions and their lookup tables shared by content (across many stores)"
+    __slots__ = ('_types', '_attrs', '_models', '_tables')
+
+    def __init__(self) -> None:
+        self._types = TypeTable()
+        self._attrs: typing.Dict[AttrRecord, AttrRecord] = {}
+        self._models: typing.Dict[ModelRecord, ModelRecord] = {}
+        self._tables: typing.Dict[AttrRecords, AttrsTable] = {}
+
+    @property
+    def types(self) -> TypeTable:
+        "Returns shared attribute 'types' table"
+        return self._types
+
+    def attr(self, record: AttrRecord) -> AttrRecord:
+        "Returns the shared record with the same content"
+        return self._attrs.setdefault(record, record)
+
+    def model(self, record: ModelRecord) -> ModelRecord:
+        "Returns the shared record with the same content"
+        return self._models.setdefault(record, record)
+
+    def table(self, attrs: AttrRecords) -> AttrsTable:
+        "Returns (shared) read-only attribute 'name' to record mapping for the given model attributes"
+        result = self._tables.get(attrs)
+        if result is None:
+            table = dict((record.name, record) for record in attrs)
+            result = self._tables[attrs] = types.MappingProxyType(table) if table else Empty
+        return result
+
+    def info(self) -> PoolInfo:
+        "Returns numbers of distinct entities kept"
+        return PoolInfo(len(self._types), len(self._attrs), len(self._models), len(self._tables))
+
+    def __getstate__(self) -> typing.Tuple[typing.Any, ...]:
+        return (self._types, self._attrs, self._models)  # lookup tables are rebuilt on demand
+
+    def __setstate__(self, state: typing.Tuple[typing.Any, ...]) -> None:
+        self._types, self._attrs, self._models = state
+        self._tables = {}
+
+
+Item = typing.TypeVar('Item')
+
+
+class Rebuilt(typing.Sequence[JSDocument]):
+    "Provides records as a sequence of their original JSON descriptions (rebuilt one by one on access)"
+    __slots__ = ('_items', '_rebuild')
+
+    def __init__(self, items: typing.Sequence[Item], rebuild: typing.Callable[[Item], JSDocument]):
+        self._items: typing.Sequence[typing.Any] = items
+        self._rebuild: typing.Callable[[typing.Any], JSDocument] = rebuild
+
+    @typing.overload
+    def __getitem__(self, index: int) -> JSDocument:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> 'Rebuilt':
+        ...
+
+    def __getitem__(self, index: typing.Union[int, slice]) -> typing.Union[JSDocument, 'Rebuilt']:
+        if isinstance(index, slice):
+            return Rebuilt(self._items[index], self._rebuild)
+        return self._rebuild(self._items[index])
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class Store:
+    "Keeps OpenFOAM model (e.g. 'transport') description with interned names and slotted attribute records"
+    __slots__ = ('_keys', '_models', '_categories', '_extra', '_pool')
+
+    def __init__(self, body: JSDocument, pool: typing.Optional[Pool] = None):
+        self._pool = Pool() if pool is None else pool
+        self._keys = tuple(sys.intern(key) for key in body)
+        self._models = tuple(self._model(item) for item in body.get('models', ()))
+        self._categories = tuple(
+            (sys.intern(item['name']), tuple(sys.intern(name) for name in item['models']), self._extra_of(item, 'models'))
+            for item in body.get('categories', ())
+        )
+        self._extra = types.MappingProxyType(dict((key, value) for key, value in body.items() if key not in Fields))
+
+    @staticmethod
+    def _extra_of(item: JSDocument, *fields: str) -> typing.Optional[JSDocument]:
+        "Returns fields of the item not kept in the compact form ('None' if none)"
+        extra = dict((key, value) for key, value in item.items() if key != 'name' and key not in fields)
+        return extra if extra else None
+
+    def _record(self, attr: Attr) -> typing.Iterator[AttrRecord]:
+        "Repackages attribute description into compact records"
+        for typ, body in attr.items():
+            record = AttrRecord(sys.intern(body['name']), self._pool.types.intern(typ), body.get('value', Missing))
+            yield self._pool.attr(record)
+
+    def _model(self, item: JSDocument) -> ModelRecord:
+        "Repackages model description into compact record"
+        attrs = None
+        if 'attrs' in item:
+            attrs = tuple(record for attr in item['attrs'] for record in self._record(attr))
+        return self._pool.model(ModelRecord(sys.intern(item['name']), attrs, self._extra_of(item, 'attrs')))
+
+    def __getstate__(self) -> typing.Tuple[typing.Any, ...]:
+        return (self._keys, self._models, self._categories, dict(self._extra), self._pool)
+
+    def __setstate__(self, state: typing.Tuple[typing.Any, ...]) -> None:
+        self._keys, self._models, self._categories, extra, self._pool = state
+        self._extra = types.MappingProxyType(extra)
+
+    @property
+    def pool(self) -> Pool:
+        "Returns pool the records are shared through"
+        return self._pool
+
+    @property
+    def models(self) -> typing.Tuple[ModelRecord, ...]:
+        "Returns model records in the original order"
+        return self._models
+
+    @property
+    def categories(self) -> typing.Iterator[typing.Tuple[Name, typing.Tuple[Name, ...]]]:
+        "Iterates over 'category' names and corresponding 'models' in the original order"
+        return ((name, models) for name, models, _ in self._categories)
+
+    @property
+    def keys(self) -> typing.Tuple[Name, ...]:
+        "Returns top level field names in the original order"
+        return self._keys
+
+    def field(self, key: Name) -> typing.Any:
+        "Returns top level field ('models'/'categories' ones are rebuilt lazily, item by item)"
+        if key == 'models':
+            return Rebuilt(self._models, ModelRecord.to_model)
+        if key == 'categories':
+            return Rebuilt(self._categories, lambda item: self._category(*item))
+        return self._extra[key]
+
+    def to_document(self) -> JSDocument:
+        "Rebuilds the original JSON description"
+        result: typing.Dict[str, typing.Any] = {}
+        for key in self._keys:
+            value = self.field(key)
+            result[key] = list(value) if key in Fields else value
+        return result
+
+    @staticmethod
+    def _category(name: Name, models: typing.Tuple[Name, ...], extra: typing.Optional[JSDocument]) -> JSDocument:
+        "Rebuilds the original JSON description of a category"
+        result: typing.Dict[str, typing.Any] = {'name': name, 'models': list(models)}
+        if extra:
+            result.update(extra)
+        return result
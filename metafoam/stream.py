@@ -0,0 +1,251 @@
+"""Defines streaming validation of (very large) OpenFOAM 'core' documents
+"""
+import json
+import typing
+
+from .common import JSSchema, Name
+from .common import check, validate, validator, pointer2schema, resolve, descend, validate_model
+from .cache import fingerprint
+
+Whitespace = ' \t\n\r'  #: insignificant JSON whitespace
+Streamed = {'models': 'name', 'categories': 'models'}  #: 'transport' arrays read element by element (and what is kept)
+
+
+class Reader:
+    "Provides incremental JSON tokenizer reading the text stream chunk by chunk"
+    __slots__ = ('_stream', '_chunk', '_buffer', '_position', '_eof', '_decoder')
+
+    def __init__(self, stream: typing.TextIO, chunk: int = 65536):
+        assert chunk > 0, chunk
+        self._stream = stream
+        self._chunk = chunk
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _more(self, size: int) -> bool:
+        "Appends next chunk to the (compacted) buffer, returns 'False' at the end of the stream"
+        data = self._stream.read(size)
+        if not data:
+            self._eof = True
+            return False
+
+        self._buffer = self._buffer[self._position:] + data
+        self._position = 0
+        return True
+
+    def peek(self) -> str:
+        "Returns next significant character ('' at the end of the stream)"
+        while True:
+            buffer, position = self._buffer, self._position
+            while position < len(buffer) and buffer[position] in Whitespace:
+                position += 1
+            self._position = position
+
+            if position < len(buffer):
+                return buffer[position]
+            if not self._more(self._chunk):
+                return ''
+
+    def expect(self, char: str) -> None:
+        "Consumes the given character"
+        found = self.peek()
+        if found != char:
+            raise ValueError("Expecting '{}' but found '{}' in JSON stream".format(char, found))
+        self._position += 1
+
+    def value(self) -> typing.Any:
+        "Decodes next complete JSON value"
+        self.peek()
+        size = self._chunk
+        while True:
+            try:
+                result, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if self._more(size):
+                    size *= 2
+                    continue
+                raise
+
+            if end == len(self._buffer) and not self._eof and self._more(size):
+                continue  # number literal could be split by the chunk boundary
+
+            self._position = end
+            return result
+
+    def object(self) -> typing.Iterator[str]:
+        "Iterates over object keys, the caller is supposed to consume corresponding values"
+        self.expect('{')
+        if self.peek() == '}':
+            self._position += 1
+            return
+
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError('Expecting JSON object key but found {!r}'.format(key))
+            self.expect(':')
+            yield key
+
+            if self.peek() == ',':
+                self._position += 1
+                continue
+            self.expect('}')
+            return
+
+    def array(self) -> typing.Iterator[int]:
+        "Iterates over array items, the caller is supposed to consume them"
+        self.expect('[')
+        if self.peek() == ']':
+            self._position += 1
+            return
+
+        index = 0
+        while True:
+            yield index
+            index += 1
+
+            if self.peek() == ',':
+                self._position += 1
+                continue
+            self.expect(']')
+            return
+
+
+class Array:
+    "Validates array items one by one against the corresponding subschema"
+    __slots__ = ('_schema', '_pointer', '_body', '_validators', '_hashes', '_count', '_where')
+
+    def __init__(self, schema: JSSchema, pointer: str, where: str):
+        self._schema = schema
+        self._pointer = pointer
+        self._body = resolve(schema, pointer)
+        self._validators: typing.Dict[str, typing.Any] = {}
+        self._hashes: typing.Optional[typing.Set[str]] = set() if self._body.get('uniqueItems') else None
+        self._count = 0
+        self._where = where
+
+    def _error(self, message: str) -> Exception:
+        "Composes validation error for the array"
+        import jsonschema as js  # pylint: disable=import-outside-toplevel
+
+        error: Exception = js.exceptions.ValidationError('{} (in {})'.format(message, self._where))
+        return error
+
+    def _item_pointer(self, index: int) -> typing.Optional[str]:
+        "Returns pointer to the given item subschema ('None' if any item is allowed)"
+        items = self._body.get('items', True)
+        if isinstance(items, dict):
+            return '{}/items'.format(self._pointer)
+        if isinstance(items, list):
+            if index < len(items):
+                return '{}/items/{}'.format(self._pointer, index)
+
+            additional = self._body.get('additionalItems', True)
+            if additional is False:
+                raise self._error('Additional items are not allowed')
+            if isinstance(additional, dict):
+                return '{}/additionalItems'.format(self._pointer)
+        return None
+
+    def item(self, value: typing.Any) -> None:
+        "Validates next item"
+        pointer = self._item_pointer(self._count)
+        self._count += 1
+
+        if pointer is not None:
+            if pointer not in self._validators:
+                self._validators[pointer] = validator(pointer2schema(self._schema, pointer))
+            check(value, self._validators[pointer])
+
+        if self._hashes is not None:
+            digest = fingerprint(value)
+            if digest in self._hashes:
+                raise self._error('{!r} has non-unique elements'.format(value))
+            self._hashes.add(digest)
+
+    def close(self) -> None:
+        "Validates array level constraints"
+        if self._count < self._body.get('minItems', 0):
+            raise self._error('Expected at least {} items'.format(self._body['minItems']))
+        if 'maxItems' in self._body and self._count > self._body['maxItems']:
+            raise self._error('Expected at most {} items'.format(self._body['maxItems']))
+
+
+def relaxed(schema: JSSchema, names: typing.Iterable[Name]) -> JSSchema:
+    "Returns schema copy where the given (streamed) 'transport' arrays are only checked to be arrays"
+    entry = descend(schema, schema['properties']['entry']['$ref'])
+    transport = dict(resolve(schema, descend(schema, entry, 'transport')))
+    transport['properties'] = dict(transport['properties'], **dict((name, {'type': 'array'}) for name in names))
+
+    core = dict(resolve(schema, entry))
+    core['properties'] = dict(core['properties'], transport=transport)  # shared definitions are left intact
+    return dict(schema, properties=dict(schema['properties'], entry=core))
+
+
+def streamed(schema: JSSchema) -> typing.Dict[Name, str]:
+    "Returns pointers to (dereferenced) subschemas of 'transport' arrays which can be streamed"
+    pointers = {}
+    for name in Streamed:
+        try:
+            pointers[name] = descend(schema, schema['properties']['entry']['$ref'], 'transport', name)
+        except (KeyError, IndexError, TypeError):
+            continue  # not described, so can not be streamed
+        if not isinstance(resolve(schema, pointers[name]), dict):
+            del pointers[name]
+    return pointers
+
+
+def validate_stream(stream: typing.TextIO, schema: JSSchema, chunk: int = 65536) -> None:
+    "Validates the 'core model' document read from the given text stream, keeping only model names in memory"
+    reader = Reader(stream, chunk)
+    pointers = streamed(schema)
+    if reader.peek() != '{' or not pointers:
+        validate_model(reader.value(), schema)
+        return
+
+    skeleton: typing.Dict[str, typing.Any] = {}
+    kept: typing.Dict[Name, typing.List[typing.Any]] = {}
+    for key in reader.object():
+        if key != 'transport' or reader.peek() != '{':
+            skeleton[key] = reader.value()
+            continue
+
+        body: typing.Dict[str, typing.Any] = {}
+        skeleton[key] = body
+        for name in reader.object():
+            if name not in pointers or reader.peek() != '[':
+                body[name] = reader.value()
+                continue
+
+            body[name] = []
+            kept[name] = []
+            array = Array(schema, pointers[name], 'transport/{}'.format(name))
+            for _ in reader.array():
+                item = reader.value()
+                array.item(item)
+                kept[name].append(item.get(Streamed[name]) if isinstance(item, dict) else None)
+            array.close()
+
+    if reader.peek() != '':
+        raise ValueError('Extra data after JSON document')
+
+    validate(skeleton, relaxed(schema, kept))
+
+    transport = skeleton.get('transport', {})
+    models: typing.Set[Name] = set(kept.get('models', ()))
+    models.update(item['name'] for item in transport.get('models', ()))
+
+    names: typing.Set[Name] = set()
+    for item in kept.get('categories', ()):
+        names.update(item)
+    for item in transport.get('categories', ()):
+        names.update(item['models'])
+    assert names <= models
+
+
+def validate_file(path: str, schema: JSSchema, chunk: int = 65536) -> None:
+    "Validates the 'core model' document stored in the given file"
+    with open(path, encoding='utf-8') as stream:
+        validate_stream(stream, schema, chunk)
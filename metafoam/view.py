@@ -0,0 +1,113 @@
+"""Defines read-only zero-copy views of OpenFOAM metamodel JSON documents
+"""
+import typing
+
+from .common import JSDocument, Name
+from .store import Rebuilt, Store
+
+
+def view(value: typing.Any) -> typing.Any:
+    "Wraps JSON containers (and compact stores) into read-only views, leaving scalars as is"
+    if isinstance(value, dict):
+        return MappingView(value)
+    if isinstance(value, Store):
+        return MappingView(_Fields(value))
+    if isinstance(value, (list, tuple, Rebuilt)):
+        return SequenceView(value)
+    return value
+
+
+def thaw(value: typing.Any) -> typing.Any:
+    "Returns mutable copy of the viewed value (views are turned back into plain 'dict'/'list' ones)"
+    if isinstance(value, MappingView):
+        return value.to_dict()
+    if isinstance(value, SequenceView):
+        return value.to_list()
+    return value
+
+
+class _Fields(typing.Mapping[Name, typing.Any]):
+    "Adapts compact store to the mapping of its top level fields"
+    __slots__ = ('_store',)
+
+    def __init__(self, store: Store):
+        self._store = store
+
+    def __getitem__(self, key: Name) -> typing.Any:
+        if key not in self._store.keys:
+            raise KeyError(key)
+        return self._store.field(key)
+
+    def __iter__(self) -> typing.Iterator[Name]:
+        return iter(self._store.keys)
+
+    def __len__(self) -> int:
+        return len(self._store.keys)
+
+    def __repr__(self) -> str:
+        return repr(self._store.to_document())
+
+
+class MappingView(typing.Mapping[Name, typing.Any]):
+    "Provides read-only view of JSON object (nested containers are viewed on access)"
+    __slots__ = ('_items',)
+
+    def __init__(self, items: typing.Mapping[Name, typing.Any]):
+        self._items = items
+
+    def __getitem__(self, key: Name) -> typing.Any:
+        return view(self._items[key])
+
+    def __iter__(self) -> typing.Iterator[Name]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    def __repr__(self) -> str:
+        return 'MappingView({!r})'.format(self._items)
+
+    def to_dict(self) -> JSDocument:
+        "Returns mutable deep copy"
+        return dict((key, thaw(value)) for key, value in self.items())
+
+
+class SequenceView(typing.Sequence[typing.Any]):
+    "Provides read-only view of JSON array (nested containers are viewed on access)"
+    __slots__ = ('_items',)
+
+    def __init__(self, items: typing.Sequence[typing.Any]):
+        self._items = items
+
+    @typing.overload
+    def __getitem__(self, index: int) -> typing.Any:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> 'SequenceView':
+        ...
+
+    def __getitem__(self, index: typing.Union[int, slice]) -> typing.Any:
+        if isinstance(index, slice):
+            return SequenceView(self._items[index])
+        return view(self._items[index])
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (list, tuple, SequenceView)):
+            return NotImplemented
+        return len(self) == len(other) and all(item == another for item, another in zip(self, other))
+
+    __hash__ = None  # type: ignore  # mutable underneath
+
+    def __repr__(self) -> str:
+        return 'SequenceView({!r})'.format(self._items)
+
+    def to_list(self) -> typing.List[typing.Any]:
+        "Returns mutable deep copy"
+        return [thaw(item) for item in self]
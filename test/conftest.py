@@ -0,0 +1,130 @@
+import pytest
+
+import metafoam
+from metafoam.common import definition2schema
+
+
+@pytest.fixture
+def core_document():
+    return {'transport': {
+        'models': [
+            {'name': 'A', 'attrs': [
+                {'x_attr': {'name': 'x', 'value': 1}},
+                {'y_type': {'name': 'y', 'value': '1'}},
+            ]},
+            {'name': 'B', 'attrs': [
+                {'z_attr': {'name': 'z', 'value': False}},
+            ]},
+            {'name': 'C', 'attrs': []},
+        ],
+        'categories': [
+            {'name': 'K', 'models': ['A']},
+            {'name': 'L', 'models': ['A', 'C']},
+        ],
+    }}
+
+
+@pytest.fixture
+def solver_document():
+    return {'transport': 'K'}
+
+
+@pytest.fixture
+def solver_schema():
+    return {
+        'definitions': {
+            'category': {'type': 'string'},
+            'transport': {'$ref': '#/definitions/category'},
+            'solver': {'type': 'object', 'properties': {
+                'transport': {'$ref': '#/definitions/transport'},
+            }, 'additionalProperties': False},
+        },
+    }
+
+
+@pytest.fixture
+def common_definitions():
+    return {
+        'x-type': {'title': 'x_type', 'type': 'object', 'properties': {
+            'value': {'type': 'number'},
+            'name': {'type': 'string'},
+        }, 'required': ['name'], 'additionalProperties': False},
+        'x-attr': {'title': 'x_attr', 'type': 'object', 'properties': {
+          'x_attr': {'$ref': '#/definitions/x-type'},
+        }, 'required': ['x_attr'], 'additionalProperties': False},
+
+        'y-type': {'title': 'y_type', 'type': 'object', 'properties': {
+            'value': {'type': 'string'},
+            'name': {'type': 'string'},
+        }, 'required': ['name'], 'additionalProperties': False},
+        'y-attr': {'title': 'y_attr', 'type': 'object', 'properties': {
+          'y_type': {'$ref': '#/definitions/y-type'},
+        }, 'required': ['y_type'], 'additionalProperties': False},
+
+        'z-type': {'title': 'ZType', 'type': 'object', 'properties': {
+            'value': {'type': 'boolean'},
+            'name': {'type': 'string'},
+        }, 'required': ['name'], 'additionalProperties': False},
+        'z-attr': {'title': 'ZAttr', 'type': 'object', 'properties': {
+          'z_attr': {'$ref': '#/definitions/z-type'},
+        }, 'required': ['z_attr'], 'additionalProperties': False},
+
+        'attrs': {'title': 'TAttrs', 'type': 'array', 'items': {'oneOf': [
+            {'$ref': '#/definitions/x-attr'},
+            {'$ref': '#/definitions/y-attr'},
+            {'$ref': '#/definitions/z-attr'},
+        ]}, 'additionalItems': False, 'uniqueItems': True},
+
+        'model': {'type': 'object', 'properties': {
+            'name': {'type': 'string'},
+            'attrs': {'$ref': '#/definitions/attrs'},
+        }, 'required': ['name'], 'additionalProperties': False},
+        'models': {'type': 'array', 'items': {'oneOf': [
+            {'$ref': '#/definitions/model'},
+        ]}, 'additionalItems': False, 'uniqueItems': True},
+    }
+
+
+@pytest.fixture
+def core_definitions(common_definitions):
+    specific = {
+        'names': {'type': 'array', 'items': [
+            {'type': 'string'},
+        ], 'additionalItems': {'type': 'string'}, 'uniqueItems': True},
+        'category': {'type': 'object', 'properties': {
+            'name': {'type': 'string'},
+            'models': {'$ref': '#/definitions/names'}
+        }, 'required': ['name', 'models'], 'additionalProperties': False},
+        'categories': {'type': 'array', 'items': {'oneOf': [
+            {'$ref': '#/definitions/category'}
+        ]}, 'additionalItems': False, 'uniqueItems': True},
+
+        'transport': {'type': 'object', 'properties': {
+            'models': {'$ref': '#/definitions/models'},
+            'categories': {'$ref': '#/definitions/categories'},
+        }, 'required': ['models']},
+
+        'core': {'type': 'object', 'properties': {
+            'transport': {'$ref': '#/definitions/transport'},
+        }, 'additionalProperties': False},
+    }
+
+    common_definitions.update(specific)  # (pjs) order of 'definitions' has a sense
+    return common_definitions
+
+
+@pytest.fixture
+def core_schema(core_definitions):
+    return {'definitions': core_definitions}
+
+
+@pytest.fixture
+def schema(core_schema):
+    definition2schema(core_schema, 'core')
+    return core_schema
+
+
+@pytest.fixture
+def core(core_schema, core_document):
+    definition2schema(core_schema, 'core')
+    return metafoam.Core(core_document, core_schema)
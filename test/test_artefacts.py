@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from metafoam.__main__ import main
+from metafoam import artefacts
+
+References = os.path.join(os.path.dirname(__file__), '..', 'artefacts', 'viscosity')
+
+
+def checkout(root, fork, source=None):
+    "Synthesizes fork sources the references (of the 'source' fork) would be extracted from"
+    source = source or fork
+    models = root / fork / 'src' / 'transportModels' / 'incompressible' / 'viscosityModels'
+    for model in artefacts.lines(os.path.join(References, '{}.ref'.format(source))):
+        (models / model).mkdir(parents=True)
+        (models / model / '{}.H'.format(model)).write_text('class {}\n:\n    public viscosityModel\n{{}};\n'.format(model))
+        lookups = artefacts.lines(os.path.join(References, source, '{}.ref'.format(model)))
+        (models / model / '{}.C'.format(model)).write_text(''.join(
+            '    {0}(coeffs_.lookup("{0}")),\n'.format(lookup) for lookup in reversed(lookups)
+        ))
+    return models
+
+
+@pytest.fixture
+def foams(tmp_path):
+    for fork in artefacts.forks(References):
+        checkout(tmp_path, fork)
+    return tmp_path
+
+
+def test_forks():
+    assert artefacts.forks(References) == ['foam-extend-3.0', 'openfoam-6']
+
+    reference = artefacts.reference(References, 'openfoam-6')
+    assert reference.models[:2] == ['BirdCarreau', 'Casson']
+    assert reference.attrs['strainRateFunction'] == []
+
+
+def test_check(foams, tmp_path):
+    expected = artefacts.reference(References, 'openfoam-6')
+    outcome = artefacts.check('openfoam-6', str(foams / 'openfoam-6'), expected)
+    assert outcome.valid and outcome.elapsed > 0 and outcome.diff is artefacts.NoDiff
+
+    models = foams / 'openfoam-6' / 'src' / 'transportModels' / 'incompressible' / 'viscosityModels'
+    shutil.rmtree(str(models / 'Casson'))
+    with open(str(models / 'powerLaw' / 'powerLaw.C'), 'a') as stream:
+        stream.write('    k_(dict.lookup("kappa")),\n')
+    (models / 'Newtonian' / 'Newtonian.C').write_text('')
+    (models / 'Maxwell.H').write_text('class Maxwell : public viscosityModel {};\n')
+    (models / 'Maxwell.C').write_text('lambda_(dict.lookup("lambda"))\n')
+
+    outcome = artefacts.check('openfoam-6', str(foams / 'openfoam-6'), expected)
+    assert not outcome.valid
+    assert outcome.diff == (
+        ['Maxwell'], ['Casson'],
+        {'Maxwell': ['lambda'], 'powerLaw': ['kappa']},
+        {'Casson': ['m', 'nuMax_', 'nuMin_', 'tau0'], 'Newtonian': ['nu']},
+    )
+
+    outcome = artefacts.check('openfoam-7', str(tmp_path / 'openfoam-7'), artefacts.reference(References, 'openfoam-7'))
+    assert not outcome.valid and outcome.error.startswith('no ') and outcome.found is None
+
+
+def test_compare():
+    expected = artefacts.Extraction(['A', 'B'], {'A': ['x', 'y']})
+    assert artefacts.compare(artefacts.Extraction(['B', 'A', 'A'], {'A': ['y', 'x', 'x']}), expected).empty  # as sets
+    assert artefacts.compare(artefacts.Extraction(['A'], {'A': ['x', 'y']}), expected).removed_models == ['B']
+
+
+def test_command(foams, tmp_path, capsys):
+    assert main(['check-artefacts', '--root', str(foams), '--artefacts', References, '-j', '2']) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert sorted(report['forks']) == ['foam-extend-3.0', 'openfoam-6']
+    assert all(record['valid'] and record['diff']['added_models'] == [] for record in report['forks'].values())
+    assert report['total'] == 2 and report['invalid'] == 0 and report['updated'] == []
+
+    references = tmp_path / 'references'
+    shutil.copytree(References, str(references))
+    models = foams / 'openfoam-6' / 'src' / 'transportModels' / 'incompressible' / 'viscosityModels'
+    (models / 'Casson' / 'Casson.H').write_text('')
+    checkout(foams, 'openfoam-7', 'openfoam-6').joinpath('Maxwell.H').write_text('class Maxwell : public viscosityModel {};')
+    shutil.rmtree(str(foams / 'foam-extend-3.0'))
+
+    command = ['check-artefacts', 'foam-extend-3.0', 'openfoam-6', 'openfoam-7']
+    command += ['--root', str(foams), '--artefacts', str(references)]
+    assert main(command) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report['invalid'] == 3 and report['updated'] == []
+    assert report['forks']['openfoam-6']['diff']['removed_models'] == ['Casson']
+    assert report['forks']['foam-extend-3.0']['error'].startswith('no ')
+
+    assert main(command + ['--update']) == 1  # no checkout to update 'foam-extend-3.0' references from
+    assert json.loads(capsys.readouterr().out)['updated'] == ['openfoam-6', 'openfoam-7']
+    assert 'Casson' not in artefacts.lines(str(references / 'openfoam-6.ref'))
+    assert not (references / 'openfoam-6' / 'Casson.ref').exists()
+    assert not (references / 'openfoam-7' / 'Maxwell.ref').exists()  # no 'Maxwell.C' to extract attributes from
+    openfoam6 = artefacts.reference(References, 'openfoam-6')
+    openfoam7 = artefacts.reference(str(references), 'openfoam-7')
+    assert openfoam7.models == openfoam6.models[:4] + ['Maxwell'] + openfoam6.models[4:]
+    assert openfoam7.attrs == openfoam6.attrs
+
+    assert main(command) == 1
+    assert json.loads(capsys.readouterr().out)['invalid'] == 1  # only missing 'foam-extend-3.0' checkout
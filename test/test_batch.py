@@ -0,0 +1,41 @@
+import jsonschema as js
+
+from metafoam import batch, common
+from metafoam.common import definition2schema
+
+
+def test_validate_solvers(core, solver_schema):
+    definition2schema(solver_schema, 'solver')
+    documents = [
+        {'transport': 'K'},
+        {'transport': 'M'},  # not in core 'transport/categories'
+        {'transport': 1},
+        {'a': 'b'},
+        {},
+        {'transport': 'L'},
+        {'transport': 'K'},
+    ]
+
+    common.Validators.clear()
+    results = core.validate_solvers(iter(documents), solver_schema)
+    assert common.validators_info().misses == 1
+
+    assert [result.valid for result in results] == [True, False, False, False, False, True, True]
+    assert isinstance(results[1].error, AssertionError)
+    assert isinstance(results[2].error, js.exceptions.ValidationError)
+    assert isinstance(results[3].error, js.exceptions.ValidationError)
+    assert isinstance(results[4].error, KeyError)
+    assert results[6] is results[0]
+
+
+def test_deduplication(core, solver_schema, monkeypatch):
+    definition2schema(solver_schema, 'solver')
+
+    calls = []
+    validate_solver = batch.validate_solver
+    monkeypatch.setattr(batch, 'validate_solver', lambda *args: calls.append(args) or validate_solver(*args))
+
+    results = core.validate_solvers([{'transport': 'K'}] * 100 + [{'transport': 'M'}] * 100, solver_schema)
+    assert len(results) == 200
+    assert len(calls) == 2
+    assert results[-1].error is results[100].error
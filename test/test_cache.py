@@ -0,0 +1,134 @@
+import copy
+
+import pytest
+
+import jsonschema as js
+
+import metafoam
+from metafoam import common, namespace
+from metafoam.cache import LRUCache, fingerprint
+
+
+def test_fingerprint():
+    assert fingerprint({'a': 1, 'b': [1, 2]}) == fingerprint({'b': [1, 2], 'a': 1})
+    assert fingerprint({'a': 1}) != fingerprint({'a': '1'})
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+
+    assert cache.get('a', lambda: 1) == 1
+    assert cache.get('a', lambda: 2) == 1
+    assert cache.info() == (1, 1, 2, 1)
+
+    cache.get('b', lambda: 2)
+    cache.get('a', lambda: 0)  # 'a' becomes the most recently used
+    cache.get('c', lambda: 3)  # so 'b' is evicted
+    assert cache.get('b', lambda: 4) == 4
+    assert cache.get('a', lambda: 0) == 0  # 'a' evicted by 'b' in turn
+
+    assert cache.discard('a')
+    assert not cache.discard('a')
+
+    cache.get('d', lambda: 5)
+    assert cache.info().currsize == 2
+    cache.resize(1)
+    assert cache.info().currsize == 1
+
+    cache.clear()
+    assert cache.info() == (0, 0, 1, 0)
+
+    with pytest.raises(AssertionError):
+        LRUCache(maxsize=0)
+
+
+def test_validators_cache():
+    schema = {'definitions': {'name': {'type': 'string'}}}
+    common.definition2schema(schema, 'name')
+
+    common.Validators.clear()
+    for _ in range(3):
+        common.validate('A', schema)
+    assert common.validators_info() == (2, 1, common.Validators.info().maxsize, 1)
+
+    with pytest.raises(js.exceptions.ValidationError):
+        common.validate(1, schema)
+    assert common.validators_info().hits == 3
+
+    with pytest.raises(js.exceptions.SchemaError):
+        common.validate('A', {'type': 1})
+
+
+def test_validators_identity(monkeypatch):
+    schema = {'definitions': {'name': {'type': 'string'}}}
+    common.definition2schema(schema, 'name')
+    common.validate('A', schema)
+    assert common.Fingerprints[id(schema)][0] is schema
+
+    monkeypatch.setattr(common, 'fingerprint', None)  # known schemas are not hashed again
+    common.validate('A', schema)
+    monkeypatch.undo()
+
+    schema['definitions']['name']['type'] = 'integer'  # changed in place
+    with pytest.raises(js.exceptions.ValidationError):
+        common.validate('A', schema)
+
+    schema['definitions']['name'] = {'const': 1}
+    common.validate(1, schema)
+    schema['definitions']['name']['const'] = True  # equal in Python, but another JSON value
+    with pytest.raises(js.exceptions.ValidationError):
+        common.validate(1, schema)
+    fingerprint = common.Fingerprints[id(schema)][2]
+    schema['definitions']['name']['const'] = 1.0
+    common.validate(1, schema)
+    assert common.Fingerprints[id(schema)][2] != fingerprint
+    assert common.strict([1, {'a': 'b'}]) == [1, {'a': 'b'}] and common.strict([1]) != [True]
+
+    monkeypatch.setattr(common.Validators, '_maxsize', 1)
+    common.validate(1, {'properties': {'entry': {'type': 'integer'}}})
+    assert len(common.Fingerprints) == 1
+
+
+@pytest.fixture
+def attr_schema():
+    schema = {'definitions': {
+        'x-type': {'title': 'x_type', 'type': 'object', 'properties': {
+            'value': {'type': 'number'},
+            'name': {'type': 'string'},
+        }, 'required': ['name'], 'additionalProperties': False},
+        'core': {'type': 'object'},
+    }}
+    common.definition2schema(schema, 'core')
+    return schema
+
+
+def test_namespaces_cache(attr_schema):
+    namespace.invalidate()
+
+    first = namespace.build(attr_schema)
+    assert namespace.build(copy.deepcopy(attr_schema)) is first
+    assert namespace.info() == (1, 1, namespace.Namespaces.info().maxsize, 1)
+
+    assert namespace.build(attr_schema, named_only=True) is not first
+    assert namespace.info().currsize == 2
+
+    namespace.invalidate(attr_schema)
+    assert namespace.info().currsize == 0
+    assert namespace.build(attr_schema) is not first
+
+    maxsize = namespace.info().maxsize
+    namespace.resize(1)
+    namespace.build(attr_schema, strict=False)
+    assert namespace.info().currsize == 1
+    namespace.resize(maxsize)
+
+
+def test_namespace_shared_by_cores(attr_schema):
+    document = {'transport': {'models': [], 'categories': []}}
+    first = metafoam.Core(document, attr_schema)
+    second = metafoam.Core(document, copy.deepcopy(attr_schema))
+    assert first.namespace() is second.namespace()
+
+    instance = second.namespace().x_type(name='x')
+    instance.value = 1
+    assert instance.value == 1
@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+import python_jsonschema_objects as pjs
+
+import metafoam
+from metafoam import codegen, namespace
+from metafoam.__main__ import main
+from metafoam.common import definition2schema
+
+
+@pytest.fixture
+def generated(core_schema, tmp_path):
+    definition2schema(core_schema, 'core')
+    path = str(tmp_path / 'generated_core.py')
+    codegen.write(core_schema, path)
+
+    module = codegen.load(path)
+    yield module
+    namespace.unregister(module)
+
+
+def test_generated_classes(generated):
+    assert sorted(generated.CLASSES) == ['ZType', 'x_type', 'y_type']
+
+    with pytest.raises(pjs.validators.ValidationError):
+        generated.x_type()  # check on 'required'
+
+    x = generated.x_type(name='x1')
+    assert x.name == 'x1'
+    assert x.value is None
+    assert x.validate()
+
+    with pytest.raises(pjs.validators.ValidationError):
+        x.dummy = 1  # check on 'additionalProperties'
+
+    for value in ('txt', True, None):
+        with pytest.raises(pjs.validators.ValidationError):
+            x.value = value
+    assert x.value is None
+
+    x.value = 10
+    assert x.value == 10
+    assert x.as_dict() == {'name': 'x1', 'value': 10}
+    assert repr(x) == "<x_type {'value': 10, 'name': 'x1'}>"
+
+    z = generated.ZType(name='z', value=False)
+    assert z.value is False
+    assert generated.ZType.value.name == 'value'
+
+
+def test_generated_core(generated, core_schema, core_document, solver_schema, solver_document):
+    definition2schema(solver_schema, 'solver')
+
+    core = metafoam.Core(core_document, core_schema)
+    assert isinstance(core.namespace(), namespace.Generated)
+    assert core.namespace().module is generated
+    assert core.namespace().x_type is generated.x_type
+
+    transport = metafoam.Solver(solver_document, solver_schema, core).transport
+    transport.category = 'L'
+    transport.model = 'A'
+
+    instance = transport.attr('y')
+    assert isinstance(instance, generated.y_type)
+    assert instance.value == '1'
+
+    with pytest.raises(pjs.validators.ValidationError):
+        instance.value = 1
+    assert instance.value == '1'
+
+    attrs = core.namespace().attrs([])  # not generated, so built by 'python_jsonschema_objects'
+    assert len(attrs) == 0
+
+
+def test_load_by_name(core_schema, tmp_path, monkeypatch):
+    definition2schema(core_schema, 'core')
+    codegen.write(core_schema, str(tmp_path / 'generated_by_name.py'))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    module = codegen.load('generated_by_name')
+    assert namespace.build(core_schema, *namespace.CoreOptions).module is module
+
+    namespace.unregister(module)
+    assert not isinstance(namespace.build(core_schema, *namespace.CoreOptions), namespace.Generated)
+
+
+@pytest.mark.parametrize('definition', [
+    {'type': 'array'},
+    {'type': 'object', 'properties': {}, 'pattern': 'x', 'additionalProperties': False},
+    {'type': 'object', 'properties': {}},
+    {'title': 'x-y', 'type': 'object', 'properties': {}, 'additionalProperties': False},
+    {'type': 'object', 'properties': {'_x': {'type': 'string'}}, 'additionalProperties': False},
+    {'type': 'object', 'properties': {'x': {'$ref': '#/definitions/x'}}, 'additionalProperties': False},
+    {'type': 'object', 'properties': {'x': {'type': 'string', 'enum': ['a']}}, 'additionalProperties': False},
+    {'type': 'object', 'properties': {'x': {'type': []}}, 'additionalProperties': False},
+    {'type': 'object', 'properties': {'x': {'type': 'any'}}, 'additionalProperties': False},
+    {'type': 'object', 'properties': {}, 'required': ['x'], 'additionalProperties': False},
+])
+def test_not_generated(definition):
+    assert codegen.generated_class('x', definition) is None
+
+
+def test_generated_multiple_types():
+    text = codegen.generated_class('x', {'type': 'object', 'properties': {
+        'value': {'type': ['string', 'null', 'integer', 'array', 'object', 'boolean']},
+    }, 'additionalProperties': False})
+    assert "value = _Property('value', 'string', 'null', 'integer', 'array', 'object', 'boolean')" in text
+
+
+def test_cli(core_definitions, tmp_path, capsys):
+    path = tmp_path / 'schema.json'
+    path.write_text(json.dumps({'definitions': core_definitions}))
+
+    assert main(['generate', str(path)]) == 0
+    assert 'class x_type(_Object):' in capsys.readouterr().out
+
+    schema = {'definitions': core_definitions}
+    definition2schema(schema, 'transport')
+    path.write_text(json.dumps(schema))
+
+    output = tmp_path / 'generated.py'
+    assert main(['generate', str(path), '--output', str(output)]) == 0
+    assert "SCHEMA_HASH = '{0}'".format(metafoam.cache.fingerprint(schema)) in output.read_text()
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from metafoam.__main__ import main
+from metafoam import extract
+
+
+@pytest.fixture
+def foam(tmp_path):
+    models = tmp_path / 'src' / 'transportModels' / 'incompressible' / 'viscosityModels'
+    for name, lookups in (
+        ('powerLaw', ['k', 'n', 'nuMin', 'nuMax']),
+        ('Newtonian', ['nu']),
+        ('BirdCarreau', ['nuInf', 'k', 'n', 'a', 'K']),
+    ):
+        (models / name).mkdir(parents=True)
+        (models / name / '{}.H'.format(name)).write_text('class {}\n:\n    public viscosityModel\n{{}};\n'.format(name))
+        (models / name / '{}.C'.format(name)).write_text(''.join(
+            '    {0}_(coeffs.lookup("{0}")),\n'.format(lookup) for lookup in lookups
+        ) + '    n_(dict.lookup("n")), // repeated\n')
+
+    (models / 'casson').mkdir()
+    (models / 'casson' / 'casson.H').write_text('class casson : Public ViscosityModel {};\n')  # case-insensitive
+    (models / 'casson' / 'casson.C').write_text('m_(a.lookup("skipped").lookup("m")),\nx_(lookupOrDefault("x", 1)),\n')
+
+    (models / 'viscosityModel').mkdir()
+    (models / 'viscosityModel' / 'viscosityModel.H').write_text('class viscosityModel {};\n')
+    (models / 'viscosityModel' / 'viscosityModel.C').write_text('')
+    (models / 'viscosityModel' / 'Make').mkdir()
+    (models / 'viscosityModel' / 'Make' / 'files').write_text('public viscosityModel\n')  # not a candidate
+
+    return tmp_path
+
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_extract(foam, processes):
+    result = extract.extract(str(foam / 'src' / 'transportModels'), jobs=2, processes=processes)
+    assert result.models == ['BirdCarreau', 'casson', 'Newtonian', 'powerLaw']
+    assert result.attrs == {
+        'BirdCarreau': ['a', 'K', 'k', 'n', 'nuInf'],
+        'casson': ['m'],
+        'Newtonian': ['n', 'nu'],
+        'powerLaw': ['k', 'n', 'nuMax', 'nuMin'],
+    }
+
+
+def test_scan(foam):
+    root = foam / 'src' / 'transportModels' / 'incompressible' / 'viscosityModels'
+    assert extract.scan(str(root / 'viscosityModel' / 'viscosityModel.C'), 'viscosityModel').lookups == []
+    assert extract.scan(str(root / 'viscosityModel' / 'viscosityModel.H'), 'viscosityModel') == (
+        str(root / 'viscosityModel' / 'viscosityModel.H'), False, None
+    )
+
+    (root / 'derived.H').write_text('')
+    assert not extract.scan(str(root / 'derived.H'), 'viscosityModel').derived
+    assert extract.unique(['a', 'a', 'b', 'a']) == ['a', 'b', 'a']
+    assert extract.model_name('/a/b/powerLaw.template.C') == 'powerLaw'
+
+
+def test_command(foam, capsys):
+    assert main(['extract', str(foam), '--jobs', '1']) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result['models'] == ['BirdCarreau', 'casson', 'Newtonian', 'powerLaw']
+    assert result['attrs']['casson'] == ['m']
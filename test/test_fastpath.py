@@ -0,0 +1,116 @@
+import copy
+
+import pytest
+
+import jsonschema as js
+
+from metafoam import common, fastpath
+from metafoam.common import definition2schema
+
+
+def parity(schema, documents):
+    compiled = common.compile_schema(schema)
+    accepts = fastpath.predicate(compiled)
+    assert accepts is not None
+    reference = js.validators.validator_for(schema)(schema)
+    for document in documents:
+        assert accepts({'entry': document}) == reference.is_valid({'entry': document}), document
+
+
+def variants(core_document):
+    yield core_document
+    yield {}
+    yield {'transport': {'models': []}}
+    yield {'transport': {'models': [], 'categories': []}}
+    yield {'transport': {'models': [{'name': 'A'}, {'name': 'A'}]}}  # 'uniqueItems'
+    yield {'transport': {'models': [{'name': 'A', 'attrs': [{'z_attr': {'name': 'z', 'value': 1}}]}]}}
+    yield {'transport': {'models': [{'name': 'A', 'attrs': [{'x_attr': {'name': 'x', 'value': 1.5}}]}]}}
+    yield {'transport': {'models': [{'name': 'A', 'attrs': [{'x_attr': {'name': 'x', 'value': True}}]}]}}
+    yield {'transport': {'models': [{'name': 'A', 'attrs': [{'x_attr': {'name': 'x'}, 'y_type': {'name': 'y'}}]}]}}
+    yield {'transport': {'models': [{'name': 'A', 'attrs': [{'x_attr': {'value': 1}}]}]}}  # 'required'
+    yield {'transport': {'models': [{'name': 'A', 'extra': 1}]}}  # 'additionalProperties'
+    yield {'transport': {'models': [{'name': 'A'}], 'categories': [{'name': 'K', 'models': []}]}}
+    yield {'transport': {'models': [{'name': 'A'}], 'categories': [{'name': 'K', 'models': ['A', 1]}]}}  # 'additionalItems'
+    yield {'transport': {'models': [{'name': 'A'}], 'categories': [{'name': 'K', 'models': ['A', 'A']}]}}
+    yield {'transport': {'models': [{'name': 'A'}], 'categories': [{'name': 'K', 'models': [1]}]}}
+    yield {'transport': {'models': {}, 'categories': [{'name': 'K'}]}}
+    yield {'transport': {'models': [], 'other': 1}}
+    yield {'transport': 'K'}
+    yield {'other': {}}
+    yield []
+
+
+def test_core_parity(core_schema, core_document):
+    definition2schema(core_schema, 'core')
+    parity(core_schema, list(variants(core_document)))
+
+    accepts = fastpath.predicate(common.compile_schema(core_schema))
+    for document in variants(core_document):
+        if accepts({'entry': document}):
+            common.validate(document, core_schema)
+        else:
+            with pytest.raises(js.exceptions.ValidationError):
+                common.validate(document, core_schema)  # rejected documents get 'jsonschema' errors
+
+
+def test_solver_parity(solver_schema, solver_document):
+    definition2schema(solver_schema, 'solver')
+    parity(solver_schema, [solver_document, {}, {'transport': 1}, {'transport': 'K', 'other': 1}, 'K', None])
+    assert isinstance(common.validator(solver_schema), fastpath.Validator)
+
+
+def test_keywords():
+    schema = {'$schema': 'http://json-schema.org/draft-07/schema#', 'definitions': {
+        'node': {'type': ['object', 'null'], 'properties': {
+            'children': {'type': 'array', 'items': {'$ref': '#/definitions/node'}},
+            'number': {'type': 'integer'},
+        }, 'additionalProperties': {'type': ['number', 'boolean']}},
+        'tuple': {'items': [{'type': 'string'}], 'additionalItems': {'type': 'number'}, 'uniqueItems': True},
+    }, 'properties': {'entry': {'properties': {
+        'tree': {'$ref': '#/definitions/node'},
+        'tuple': {'$ref': '#/definitions/tuple'},
+        'values': {'uniqueItems': True},
+        'closed': {'items': [{'type': 'string'}], 'additionalItems': False},
+        'open': {'items': [{'type': 'string'}]},
+        'never': False,
+    }}}}
+    parity(schema, [
+        {'tree': {'children': [{'children': [], 'number': 1.0}, None]}},
+        {'tree': {'children': [{'children': [{'number': 1.5}]}]}},
+        {'tree': {'number': True}}, {'tree': {'extra': 1.5, 'flag': False}}, {'tree': {'extra': 'a'}},
+        {'tuple': ['a', 1, 2]}, {'tuple': ['a', 1, 1.0]}, {'tuple': [1]}, {'tuple': ['a', 'b']}, {'tuple': 'a'},
+        {'values': [1, True]}, {'values': [0, False]}, {'values': [{'a': [1]}, {'a': [1]}]}, {'values': [[True], [1]]},
+        {'values': [{'a': 1}, {'a': 2}, 'a', 1, None]},
+        {'closed': ['a']}, {'closed': ['a', 'b']}, {'open': ['a', 1]}, {'open': [1]},
+        {'never': 1}, 1,
+    ])
+
+    source = fastpath.generate(common.compile_schema(schema))
+    assert source.count('def _v') == 16  # one function per distinct subschema
+    assert source.startswith("_c0 = frozenset(")  # built once
+
+
+@pytest.mark.parametrize('schema', [
+    {'$schema': 'http://json-schema.org/draft-04/schema#'},
+    {'properties': {'entry': {'enum': [1]}}},
+    {'properties': {'entry': {'type': 'decimal'}}},
+    {'properties': {'entry': {'oneOf': []}}},
+    {'properties': {'entry': {'$ref': 'other.json#/definitions/a'}}},
+    {'properties': {'entry': {'$ref': '#/definitions/missing'}}},
+    {'properties': {'entry': {'$ref': '#/definitions/a/properties/b'}}},
+    {'properties': {'entry': {'items': [1]}}},
+])
+def test_unsupported(schema):
+    assert fastpath.generate(schema) is None and fastpath.predicate(schema) is None
+
+
+def test_validator(solver_schema):
+    definition2schema(solver_schema, 'solver')
+    compiled = common.validator(solver_schema)
+    assert compiled.schema == common.compile_schema(solver_schema)
+    assert compiled.is_valid({'entry': {'transport': 'K'}}) and not compiled.is_valid({'entry': {'transport': 1}})
+    assert list(compiled.iter_errors({'entry': {'transport': 'K'}})) == []
+
+    fallback = js.validators.validator_for(solver_schema)(copy.deepcopy(solver_schema))
+    strict = fastpath.Validator(lambda instance: False, fallback)
+    assert strict.is_valid({'entry': {'transport': 'K'}})  # false rejections only cost time
@@ -0,0 +1,33 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import metafoam
+
+Heavy = ('jsonschema', 'python_jsonschema_objects')
+
+
+def loaded(statement):
+    "Lists heavy modules loaded by the statement in a fresh interpreter"
+    code = '{}\nimport json, sys\nprint(json.dumps(sorted(name for name in sys.modules if name.startswith({!r}))))'.format(
+        statement, Heavy
+    )
+    return json.loads(subprocess.check_output([sys.executable, '-c', code], universal_newlines=True))
+
+
+def test_deferred():
+    assert loaded('import metafoam') == []
+    assert loaded('from metafoam import Core, Solver, common, json_format, registry\nimport metafoam.__main__') == []
+    assert 'jsonschema' in loaded('from metafoam import common\ncommon.validate({}, {})')
+
+
+def test_lazy_attributes():
+    from metafoam.core import Core
+    from metafoam.solver import Solver
+    assert metafoam.Core is Core and metafoam.Solver is Solver
+    assert {'Core', 'Solver'} <= set(dir(metafoam))
+
+    with pytest.raises(AttributeError):
+        metafoam.Unknown
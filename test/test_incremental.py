@@ -0,0 +1,111 @@
+import pytest
+
+import jsonschema as js
+
+import metafoam
+from metafoam.common import definition2schema
+
+
+@pytest.fixture
+def schema(solver_schema):
+    solver_schema['definitions']['solver']['properties'].update({
+        'steps': {'type': 'integer'},
+        'options': {'type': 'object', 'properties': {
+            'tolerance': {'type': 'number'},
+        }},
+    })
+    definition2schema(solver_schema, 'solver')
+    return solver_schema
+
+
+def test_incremental(core, schema):
+    document = {'transport': 'K', 'steps': 1, 'options': {'tolerance': 0.1}}
+    solver = metafoam.Solver(document, schema, core, incremental=True)
+    assert solver.dirty == set()
+
+    solver.transport.category = 'L'
+    assert solver.dirty == {'transport'}
+    solver.validate()
+    assert solver.dirty == set()
+
+    document['steps'] = 'many'  # not marked, so not re-validated
+    solver.update(('options', 'tolerance'), 1e-3)
+    solver.validate()
+
+    solver.update(('options', 'tolerance'), 'small')
+    with pytest.raises(js.exceptions.ValidationError):
+        solver.validate()
+    assert solver.dirty == {'options'}  # stays dirty until fixed
+
+    solver.update(('options', 'tolerance'), 1e-3)
+    solver.update(('steps',), 10)
+    solver.validate()
+
+    solver.update(('transport',), 'M')
+    with pytest.raises(AssertionError):
+        solver.validate()  # semantic check on core 'transport/categories'
+    solver.update(('transport',), 'K')
+    solver.validate()
+
+
+def test_incremental_fallback(core, schema):
+    document = {'transport': 'K'}
+    solver = metafoam.Solver(document, schema, core, incremental=True)
+
+    solver.update(('extra',), 1)
+    with pytest.raises(js.exceptions.ValidationError):
+        solver.validate()  # check on 'additionalProperties'
+
+    del document['extra']
+    solver.validate()
+
+    del document['transport']
+    solver.mark(('transport',))
+    solver.validate()  # removed properties are checked by the whole document validation
+
+
+@pytest.mark.parametrize('keyword', [{'patternProperties': {'^t': {'enum': ['K']}}}, {'maxProperties': 1}])
+def test_entity_keywords(core, schema, keyword):
+    schema['definitions']['solver'].update(keyword)
+    document = {'transport': 'K'}
+    solver = metafoam.Solver(document, schema, core, incremental=True)
+
+    solver.transport.category = 'L'
+    document['steps'] = 1
+    solver.mark(('steps',))
+    with pytest.raises(js.exceptions.ValidationError):
+        solver.validate()  # the whole document is checked against the entity keywords
+
+
+def test_escaped_names(core, solver_schema):
+    solver_schema['definitions'] = {
+        'a/b': {'$ref': '#/definitions/solver~0c'},
+        'solver~c': {'type': 'object', 'properties': {
+            'transport': {'type': 'string'},
+            'a/b': {'type': 'integer'},
+        }},
+    }
+    definition2schema(solver_schema, 'a/b')
+    solver_schema['properties']['entry']['$ref'] = '#/definitions/a~1b'
+    document = {'transport': 'K', 'a/b': 1}
+    solver = metafoam.Solver(document, solver_schema, core, incremental=True)
+
+    solver.update(('a/b',), 'many')
+    with pytest.raises(js.exceptions.ValidationError):
+        solver.validate()
+    solver.update(('a/b',), 2)
+    solver.validate()
+
+
+def test_not_incremental(core, schema):
+    document = {'transport': 'K'}
+    solver = metafoam.Solver(document, schema, core)
+
+    solver.update(('steps',), 'many')
+    assert solver.dirty == set()
+    with pytest.raises(js.exceptions.ValidationError):
+        solver.validate()
+
+    solver.update(('steps',), 1)
+    solver.transport.category = 'L'
+    solver.validate()
@@ -0,0 +1,139 @@
+import pytest
+
+import metafoam
+from metafoam.common import definition2schema
+from metafoam.index import Index
+from metafoam.store import AttrRecord
+
+
+def test_core_indexes(core, core_document):
+    categories = core.categories('transport')
+    assert categories == {'K': ('A',), 'L': ('A', 'C')}
+    assert core.categories('transport') is categories  # no per-call rebuilds
+
+    models = core.models('transport')
+    assert list(models) == ['A', 'B', 'C']
+    assert [record.to_attr() for record in models['B']] == core_document['transport']['models'][1]['attrs']
+    assert core.models('transport') is models
+
+    attrs = core.attrs('transport', 'A')
+    assert attrs == {'x': AttrRecord('x', 'x_attr', 1), 'y': AttrRecord('y', 'y_type', '1')}
+    assert attrs['y'].type == 'y_type'
+    assert core.attrs('transport', 'C') == {}
+
+    assert core.index('transport').categories is categories
+
+
+def test_read_only(core):
+    with pytest.raises(TypeError):
+        core.categories('transport')['M'] = ()
+
+    with pytest.raises(TypeError):
+        core.models('transport')['D'] = ()
+
+    with pytest.raises(TypeError):
+        core.attrs('transport', 'A')['z'] = AttrRecord('z', 'z_attr', True)
+
+
+def test_partial_description():
+    index = Index({'models': [{'name': 'A'}, {'name': 'B', 'attrs': [{'x_attr': {'name': 'x'}}]}]})
+    assert index.categories == {}
+    assert index.attrs('A') == {}
+    assert (index.attrs('B')['x'].type, index.attrs('B')['x'].value) == ('x_attr', None)
+    assert index.models['A'] == ()
+
+
+def test_core_classes(core):
+    classes = core.classes()
+    assert classes['y_type'] is core.namespace().y_type
+    assert classes['z_attr'] is None  # not defined in the 'definitions' namespace
+    assert core.classes() is classes
+
+
+def test_transport_table(core_schema, core_document, solver_schema, solver_document):
+    definition2schema(core_schema, 'core')
+    definition2schema(solver_schema, 'solver')
+    core_document['transport']['models'][1]['attrs'].append({'y_type': {'name': 'w'}})
+    core_document['transport']['categories'].append({'name': 'M', 'models': ['B']})
+
+    core = metafoam.Core(core_document, core_schema)
+    transport = metafoam.Solver(solver_document, solver_schema, core).transport
+
+    transport.model = 'A'
+    table = transport.attrs2classes()
+    assert transport.attrs2classes() is table
+    assert table['y'] == (core.namespace().y_type, '1')
+    assert transport.attrs == ['x', 'y']
+    assert transport.attrs2names() == {'x': {'type': 'x_attr', 'value': 1}, 'y': {'type': 'y_type', 'value': '1'}}
+    assert transport.attr_records()['y'] == AttrRecord('y', 'y_type', '1')
+
+    transport.model = 'A'
+    assert transport.attrs2classes() is not table  # invalidated on 'model' change
+
+    transport.category = 'L'
+    with pytest.raises(AssertionError):
+        transport.attrs2classes()  # no 'model' selected anymore
+
+    transport.model = 'C'
+    assert transport.attrs2classes() == {}
+
+    transport.category = 'M'
+    transport.model = 'B'
+    with pytest.raises(AttributeError):
+        transport.attr('z')  # 'z_attr' type is not defined in the 'definitions' namespace
+
+    instance = transport.attr('w')  # no default 'value'
+    assert instance.name == 'w'
+    assert instance.value is None
+
+
+def test_lazy_core(core_schema, core_document):
+    definition2schema(core_schema, 'core')
+
+    core = metafoam.Core(core_document, core_schema, lazy=True)
+    assert core.phases == {}
+
+    assert list(core.categories('transport')) == ['K', 'L']
+    assert list(core.phases) == ['index']
+
+    core.namespace()
+    assert list(core.phases) == ['index', 'namespace']
+
+    core.document
+    assert list(core.phases) == ['index', 'namespace', 'validate']
+    phase = core.phases['validate']
+    assert phase.started >= core.phases['index'].started and phase.elapsed >= 0
+
+    eager = metafoam.Core(core_document, core_schema)
+    assert list(eager.phases) == ['validate', 'index', 'namespace']
+
+
+def test_lazy_core_validation(core_schema):
+    definition2schema(core_schema, 'core')
+    document = {'transport': {
+        'models': [{'name': 'A', 'attrs': []}],
+        'categories': [{'name': 'K', 'models': ['A', 'B']}],
+    }}
+
+    core = metafoam.Core(document, core_schema, lazy=True)
+    assert core.categories('transport') == {'K': ('A', 'B')}
+
+    with pytest.raises(AssertionError):
+        core.validate()
+    assert 'validate' not in core.phases
+
+
+def test_scalar_fields(core_schema, core_document, tmp_path):
+    definition2schema(core_schema, 'core')
+    core_schema['definitions']['core']['properties']['version'] = {'type': 'string'}
+    document = {'version': '6', 'transport': core_document['transport']}
+
+    for core in (metafoam.Core(document, core_schema), metafoam.Core(document, core_schema, lazy=True)):
+        assert list(core.categories('transport')) == ['K', 'L']
+        assert core.document == document and list(core.document) == ['version', 'transport']
+        with pytest.raises(KeyError):
+            core.index('version')
+
+    path = str(tmp_path / 'core.snapshot')
+    core.save_snapshot(path)
+    assert metafoam.Core.load_snapshot(path).document['version'] == '6'
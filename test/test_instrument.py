@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+
+import metafoam
+from metafoam.__main__ import main
+from metafoam.common import definition2schema
+from metafoam import instrument, namespace, profiling
+
+
+@pytest.fixture
+def schemas(core_schema, solver_schema):
+    definition2schema(core_schema, 'core')
+    definition2schema(solver_schema, 'solver')
+    return core_schema, solver_schema
+
+
+def test_disabled():
+    assert instrument.Hooks == []
+    assert instrument.span('validate') is instrument.Null
+    with instrument.span('validate'):
+        instrument.count('compile_validator')
+
+
+def test_phases(schemas, core_document, solver_document):
+    core_schema, solver_schema = schemas
+    namespace.invalidate(core_schema)
+    aggregator = instrument.Aggregator()
+    stream = io.StringIO()
+
+    with instrument.hooked(aggregator), instrument.hooked(instrument.JSONLines(stream)):
+        core = metafoam.Core(core_document, core_schema)
+        transport = metafoam.Solver(solver_document, solver_schema, core).transport
+        transport.model = 'A'
+        transport.attr('y')
+        transport.attr('y')
+        instrument.count('instances', 2)
+    assert instrument.Hooks == []
+
+    spans = aggregator.stats()
+    assert set(spans) == {'validate', 'build_classes', 'attr'}
+    assert spans['attr'].calls == 2 and spans['attr'].min <= spans['attr'].max <= spans['attr'].total
+    assert spans['validate'].calls == 2  # 'core' and 'solver' documents
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert sum(event['kind'] == 'span' for event in events) == sum(item.calls for item in spans.values())
+    assert aggregator.stats('count')['instances'] == (1, 2, 2, 2)
+
+    aggregator.reset()
+    assert aggregator.stats() == {}
+    instrument.unsubscribe(aggregator)  # already unsubscribed
+
+
+def test_profile(schemas, core_document, solver_document, tmp_path, capsys):
+    core_schema, solver_schema = schemas
+    core_document['transport']['models'][0]['attrs'] = [
+        {'y_type': {'name': 'y', 'value': '1'}}, {'y_type': {'name': 'w'}}, {'z_attr': {'name': 'z'}}
+    ]
+    assert profiling.exercise(core_document, core_schema, solver_document, solver_schema) == 2  # 'z_attr' is undefined
+
+    paths = {}
+    for name, document in (('core', core_document), ('core-schema', core_schema),
+                           ('solver', solver_document), ('solver-schema', solver_schema)):
+        paths[name] = tmp_path / '{}.json'.format(name)
+        paths[name].write_text(json.dumps(document))
+
+    command = ['profile'] + ['--{}={}'.format(name, path) for name, path in paths.items()]
+    assert main(command + ['--limit', '5']) == 0
+    assert 'exercise' in capsys.readouterr().out
+
+    assert main(command + ['--output', str(tmp_path / 'stats.prof'), '--events', str(tmp_path / 'events.jsonl')]) == 0
+    summary = [line.split() for line in capsys.readouterr().out.splitlines()]
+    assert ['attr', '3', 'calls'] in [line[:3] for line in summary]
+    assert (tmp_path / 'stats.prof').exists()
+    assert all(json.loads(line)['kind'] in ('span', 'count') for line in (tmp_path / 'events.jsonl').open())
@@ -0,0 +1,119 @@
+import json
+import os
+
+import pytest
+
+from metafoam.__main__ import main
+from metafoam import parallel, results
+from metafoam.common import definition2schema
+
+
+@pytest.fixture
+def corpus(tmp_path, core_definitions, core_document, solver_schema):
+    (tmp_path / 'core-schema.json').write_text(json.dumps({'definitions': core_definitions}))
+    definition2schema(solver_schema, 'solver')  # already composed 'run-time' schema is accepted as well
+    (tmp_path / 'solver-schema.json').write_text(json.dumps(solver_schema))
+    (tmp_path / 'core.json').write_text(json.dumps(core_document))
+
+    cases = tmp_path / 'cases'
+    (cases / 'nested').mkdir(parents=True)
+    for index in range(10):
+        (cases / 'solver-{}.json'.format(index)).write_text(json.dumps({'transport': 'KL'[index % 2]}))
+    (cases / 'nested' / 'core.json').write_text(json.dumps(core_document))
+    (cases / 'nested' / 'broken.json').write_text('{')
+    (cases / 'nested' / 'unknown.json').write_text(json.dumps({'transport': 'M'}))
+    (cases / 'nested' / 'invalid-core.json').write_text(json.dumps({'transport': {'models': {}}}))
+    (cases / 'notes.txt').write_text('not a JSON document')
+
+    return tmp_path
+
+
+def validate(corpus, *options):
+    return main([
+        'validate', str(corpus / 'cases'), str(corpus / 'core.json'),
+        '--core', str(corpus / 'core.json'),
+        '--core-schema', str(corpus / 'core-schema.json'),
+        '--solver-schema', str(corpus / 'solver-schema.json'),
+    ] + list(options))
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_validate(corpus, capsys, jobs):
+    assert validate(corpus, '--jobs', jobs, '--chunk-size', '3') == 1
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    summary = lines.pop()
+    assert summary['total'] == 15 and summary['valid'] == 12 and summary['invalid'] == 3
+    assert summary['jobs'] == int(jobs) and summary['elapsed'] > 0
+
+    records = dict((record['path'].rsplit('/', 1)[-1], record) for record in lines)
+    assert len(records) == 14  # 'core.json' is there twice
+    assert records['solver-3.json'] == dict(records['solver-3.json'], kind='solver', valid=True, error=None)
+    assert records['core.json']['kind'] == 'core' and records['core.json']['valid']
+    assert records['broken.json']['kind'] is None
+    assert records['broken.json']['error'].startswith('JSONDecodeError: ')
+    assert records['unknown.json']['error'] == 'AssertionError'
+    assert records['invalid-core.json']['error'].startswith('ValidationError: ')
+
+
+def test_validate_valid(corpus, capsys):
+    assert validate(corpus, '--jobs', '1') == 1
+    capsys.readouterr()
+
+    for name in ('broken.json', 'unknown.json', 'invalid-core.json'):
+        (corpus / 'cases' / 'nested' / name).unlink()
+    assert validate(corpus, '--jobs', '1') == 0
+
+
+@pytest.mark.parametrize('option', [('--jobs', '0'), ('--chunk-size', '-1'), ('--jobs', 'many')])
+def test_validate_usage(corpus, capsys, option):
+    with pytest.raises(SystemExit) as error:
+        validate(corpus, *option)
+    assert error.value.code == 2 and option[0] in capsys.readouterr().err
+
+
+def test_chunks():
+    assert parallel.chunks(list('abcde'), 2) == [['a', 'b'], ['c', 'd'], ['e']]
+    assert parallel.chunks([], 2) == []
+
+
+def test_validate_cache(corpus, capsys, monkeypatch):
+    monkeypatch.setattr(results, 'Caches', {})
+    monkeypatch.setenv(results.Directory, '')  # restored afterwards
+    monkeypatch.setenv(results.Bypass, '')
+
+    environ = dict(os.environ)
+    assert validate(corpus, '--jobs', '1', '--cache', str(corpus / 'cache')) == 1
+    assert len(os.listdir(str(corpus / 'cache'))) == 1  # entries are keyed by content ('core' documents are the same)
+    assert results.active() is None and dict(os.environ) == environ  # the caller configuration is left as is
+
+    for entry in os.listdir(str(corpus / 'cache')):
+        os.unlink(str(corpus / 'cache' / entry))
+    monkeypatch.setenv(results.Directory, str(corpus / 'cache'))
+    assert validate(corpus, '--jobs', '2', '--no-cache') == 1
+    assert os.listdir(str(corpus / 'cache')) == []
+    capsys.readouterr()
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_validate_setup(corpus, capsys, jobs):
+    (corpus / 'core.json').write_text(json.dumps({'transport': {'models': {}}}))
+    assert validate(corpus, '--jobs', jobs) == 2
+    assert capsys.readouterr().err.startswith('metafoam validate: ValidationError: ')
+
+    (corpus / 'core.json').unlink()
+    assert validate(corpus, '--jobs', jobs) == 2
+    assert capsys.readouterr().err.startswith('metafoam validate: FileNotFoundError: ')
+
+
+def test_validate_unexpected(corpus, capsys, solver_schema):
+    solver_schema['definitions']['solver']['properties']['extra'] = {'$ref': '#/definitions/missing'}
+    (corpus / 'solver-schema.json').write_text(json.dumps(solver_schema))
+    (corpus / 'cases' / 'solver-0.json').write_text(json.dumps({'transport': 'K', 'extra': 1}))
+    assert validate(corpus, '--jobs', '1') == 1
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert lines[-1]['total'] == 15
+    assert [line['error'].split(':')[0] for line in lines if line.get('path', '').endswith('solver-0.json')] == [
+        'RefResolutionError'
+    ]
@@ -0,0 +1,64 @@
+import copy
+import json
+
+import pytest
+
+from metafoam.common import definition2schema
+from metafoam.registry import Registry
+
+
+@pytest.fixture
+def registry(core_schema):
+    definition2schema(core_schema, 'core')
+    return Registry(core_schema)
+
+
+def test_shared_definitions(registry, core_document):
+    first = registry.add('openfoam-6', core_document)
+    info = registry.info()
+
+    for fork in ('openfoam-7', 'foam-extend-3.0'):
+        registry.add(fork, json.loads(json.dumps(core_document)))  # equal, but not the same objects
+    assert registry.info() == info  # grows with distinct definitions only
+
+    second = registry['foam-extend-3.0']
+    assert second.models('transport')['A'] is first.models('transport')['A']
+    assert second.attrs('transport', 'A') is first.attrs('transport', 'A')
+    assert second.document == first.document == core_document
+
+    extended = copy.deepcopy(core_document)
+    extended['transport']['models'][1]['attrs'].append({'x_attr': {'name': 'x'}})
+    third = registry.add('foam-extend-4.0', extended)
+    assert registry.info().models == info.models + 1 and registry.info().attrs == info.attrs + 1
+    assert third.models('transport')['A'] is first.models('transport')['A']
+
+    assert list(registry) == ['openfoam-6', 'openfoam-7', 'foam-extend-3.0', 'foam-extend-4.0'] and len(registry) == 4
+    assert registry.pool is first.index('transport').store.pool
+
+
+def test_forks(registry, core_document):
+    registry.add('openfoam-6', core_document)
+    assert registry.forks('B', 'z') == {'openfoam-6'}
+
+    extended = copy.deepcopy(core_document)
+    extended['transport']['models'][1]['attrs'].append({'x_attr': {'name': 'x'}})
+    extended['transport']['models'].append({'name': 'D', 'attrs': []})
+    registry.add('foam-extend-4.0', extended)
+
+    assert registry.forks('A') == {'openfoam-6', 'foam-extend-4.0'}
+    assert registry.forks('B', 'x') == {'foam-extend-4.0'}
+    assert registry.forks('D') == {'foam-extend-4.0'}
+    assert registry.forks('E') == set() and registry.forks('A', 'w') == set()
+
+    with pytest.raises(AssertionError):
+        registry.add('openfoam-6', core_document)
+
+
+def test_scalar_fields(core_schema, core_document):
+    definition2schema(core_schema, 'core')
+    core_schema['definitions']['core']['properties']['version'] = {'type': 'string'}
+    registry = Registry(core_schema)
+
+    core = registry.add('openfoam-6', dict(core_document, version='6'))
+    assert core.index_names == ('transport',)
+    assert registry.forks('A') == {'openfoam-6'}
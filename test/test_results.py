@@ -0,0 +1,138 @@
+import os
+import tempfile
+
+import pytest
+
+import jsonschema as js
+
+from metafoam import results
+from metafoam.common import validate, validate_model
+
+
+@pytest.fixture(autouse=True)
+def caches(monkeypatch):
+    monkeypatch.setattr(results, 'Caches', {})
+    monkeypatch.setenv(results.Directory, '')  # restored afterwards
+    monkeypatch.setenv(results.Bypass, '')
+
+
+def test_results(tmp_path, core_document, schema):
+    cache = results.enable(str(tmp_path / 'cache'))
+    assert results.active() is cache and cache.directory == str(tmp_path / 'cache')
+
+    validate_model(core_document, schema)
+    validate_model(core_document, schema)
+    assert cache.info() == (1, 1, results.MaxSize, 1)
+
+    core_document['transport']['models'][0]['attrs'] = 'many'
+    for _ in range(2):
+        with pytest.raises(js.exceptions.ValidationError):
+            validate_model(core_document, schema)  # failures are not recorded
+    assert cache.info() == (1, 3, results.MaxSize, 1)
+
+    key = cache.key(core_document, schema)
+    assert key != cache.key(core_document, dict(schema, title='another')) and len(key) == 64
+    cache.clear()
+    assert cache.info() == (0, 0, results.MaxSize, 0)
+
+
+def test_eviction(tmp_path):
+    cache = results.Results(str(tmp_path), maxsize=2)
+    for index in range(3):
+        cache.add(cache.key({'index': index}, {}))
+        os.utime(os.path.join(str(tmp_path), cache.key({'index': index}, {}) + results.Suffix), (index, index))
+    assert cache.key({'index': 0}, {}) not in cache  # evicted (the least recently used)
+    assert cache.key({'index': 1}, {}) in cache  # refreshed, so the next to go is the last added one
+
+    (tmp_path / 'notes.txt').write_text('not an entry')
+    cache.add(cache.key({'index': 3}, {}))
+    assert sorted(os.listdir(str(tmp_path))) == sorted(
+        [cache.key({'index': index}, {}) + results.Suffix for index in (1, 3)] + ['notes.txt']
+    )
+    assert cache.evict() == 0
+
+
+class Gone:
+    name = path = 'gone' + results.Suffix
+
+    def stat(self):
+        raise FileNotFoundError(self.path)
+
+
+def test_concurrent_writers(tmp_path, monkeypatch):
+    cache = results.Results(str(tmp_path), maxsize=1)
+    cache.add('a')
+    cache.add('b')  # evicts 'a'
+    assert 'a' not in cache and 'b' in cache
+
+    def unlink(path):
+        raise FileNotFoundError(path)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, 'unlink', unlink)
+        cache.add('c')  # 'b' is evicted by another writer meanwhile
+    with monkeypatch.context() as patch:
+        patch.setattr(os, 'scandir', lambda path: [Gone()])
+        assert cache.evict() == 0
+
+    os.mkdir(str(tmp_path / ('d' + results.Suffix)))
+    cache.add('d')  # can not replace a directory, so not recorded
+    with monkeypatch.context() as patch:
+        patch.setattr(results.json, 'dump', lambda *args: {}['unexpected'])
+        with pytest.raises(KeyError):
+            cache.add('e')
+    assert not [name for name in os.listdir(str(tmp_path)) if name.startswith('.entry-')]
+
+
+def test_amortized_eviction(tmp_path, monkeypatch):
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path: scans.append(path) or scandir(path))
+
+    cache = results.Results(str(tmp_path), maxsize=16)
+    for index in range(18):
+        cache.add(str(index))
+    assert len(scans) == 1  # counted once, the capacity is exceeded by no more than the slack
+    cache.add('18')
+    assert len(scans) == 2 and len(os.listdir(str(tmp_path))) == 16
+
+
+def test_unwritable(tmp_path, monkeypatch, core_document, schema):
+    cache = results.enable(str(tmp_path))
+
+    def denied(*args, **kwargs):
+        raise PermissionError(args)
+
+    monkeypatch.setattr(os, 'utime', denied)
+    monkeypatch.setattr(tempfile, 'mkstemp', denied)
+    validate_model(core_document, schema)  # neither looked up nor recorded
+    assert cache.info()[:2] == (0, 1) and os.listdir(str(tmp_path)) == []
+
+    monkeypatch.setattr(os, 'makedirs', denied)
+    results.Caches.clear()
+    monkeypatch.setenv(results.Directory, str(tmp_path / 'other'))
+    assert results.active() is None
+
+
+def test_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(results.Directory, str(tmp_path))
+    cache = results.active()
+    assert cache is not None and cache.directory == str(tmp_path)
+    assert results.active() is cache
+
+    validate({}, {'type': 'object'})
+    assert cache.info().currsize == 1
+
+    monkeypatch.setenv(results.Bypass, '1')
+    assert results.active() is None
+    validate({}, {'type': 'object'})
+    assert cache.info().misses == 1
+
+    monkeypatch.delenv(results.Bypass)
+    results.disable()
+    assert results.active() is None
+
+    results.Caches.clear()
+    monkeypatch.delenv(results.Directory)
+    assert results.active() is None
+    assert results.version() == results.version() and len(results.version()) == 64
@@ -1,3 +1,6 @@
+import copy
+import json
+
 import pytest
 
 import jsonschema as js
@@ -8,31 +11,6 @@ from metafoam import common
 from metafoam.common import validate, definition2schema
 
 
-@pytest.fixture
-def core_document():
-    return {'transport': {
-        'models': [
-            {'name': 'A', 'attrs': [
-                {'x_attr': {'name': 'x', 'value': 1}},
-                {'y_type': {'name': 'y', 'value': '1'}},
-            ]},
-            {'name': 'B', 'attrs': [
-                {'z_attr': {'name': 'z', 'value': False}},
-            ]},
-            {'name': 'C', 'attrs': []},
-        ],
-        'categories': [
-            {'name': 'K', 'models': ['A']},
-            {'name': 'L', 'models': ['A', 'C']},
-        ],
-    }}
-
-
-@pytest.fixture
-def solver_document():
-    return {'transport': 'K'}
-
-
 @pytest.fixture
 def transport(core_schema, core_document, solver_schema, solver_document):
     definition2schema(core_schema, 'core')
@@ -61,62 +39,6 @@ def test_transport_attrs(transport):
     assert instance.value == 'abc'
 
 
-@pytest.fixture
-def solver_schema():
-    return {
-        'definitions': {
-            'category': {'type': 'string'},
-            'transport': {'$ref': '#/definitions/category'},
-            'solver': {'type': 'object', 'properties': {
-                'transport': {'$ref': '#/definitions/transport'},
-            }, 'additionalProperties': False},
-        },
-    }
-
-
-@pytest.fixture
-def common_definitions():
-    return {
-        'x-type': {'title': 'x_type', 'type': 'object', 'properties': {
-            'value': {'type': 'number'},
-            'name': {'type': 'string'},
-        }, 'required': ['name'], 'additionalProperties': False},
-        'x-attr': {'title': 'x_attr', 'type': 'object', 'properties': {
-          'x_attr': {'$ref': '#/definitions/x-type'},
-        }, 'required': ['x_attr'], 'additionalProperties': False},
-
-        'y-type': {'title': 'y_type', 'type': 'object', 'properties': {
-            'value': {'type': 'string'},
-            'name': {'type': 'string'},
-        }, 'required': ['name'], 'additionalProperties': False},
-        'y-attr': {'title': 'y_attr', 'type': 'object', 'properties': {
-          'y_type': {'$ref': '#/definitions/y-type'},
-        }, 'required': ['y_type'], 'additionalProperties': False},
-
-        'z-type': {'title': 'ZType', 'type': 'object', 'properties': {
-            'value': {'type': 'boolean'},
-            'name': {'type': 'string'},
-        }, 'required': ['name'], 'additionalProperties': False},
-        'z-attr': {'title': 'ZAttr', 'type': 'object', 'properties': {
-          'z_attr': {'$ref': '#/definitions/z-type'},
-        }, 'required': ['z_attr'], 'additionalProperties': False},
-
-        'attrs': {'title': 'TAttrs', 'type': 'array', 'items': {'oneOf': [
-            {'$ref': '#/definitions/x-attr'},
-            {'$ref': '#/definitions/y-attr'},
-            {'$ref': '#/definitions/z-attr'},
-        ]}, 'additionalItems': False, 'uniqueItems': True},
-
-        'model': {'type': 'object', 'properties': {
-            'name': {'type': 'string'},
-            'attrs': {'$ref': '#/definitions/attrs'},
-        }, 'required': ['name'], 'additionalProperties': False},
-        'models': {'type': 'array', 'items': {'oneOf': [
-            {'$ref': '#/definitions/model'},
-        ]}, 'additionalItems': False, 'uniqueItems': True},
-    }
-
-
 @pytest.fixture
 def instance_definitions(common_definitions):
     specific = {
@@ -180,39 +102,6 @@ def test_instance_category(instance_schema, instance_document):
         validate([], instance_schema)
 
 
-@pytest.fixture
-def core_definitions(common_definitions):
-    specific = {
-        'names': {'type': 'array', 'items': [
-            {'type': 'string'},
-        ], 'additionalItems': {'type': 'string'}, 'uniqueItems': True},
-        'category': {'type': 'object', 'properties': {
-            'name': {'type': 'string'},
-            'models': {'$ref': '#/definitions/names'}
-        }, 'required': ['name', 'models'], 'additionalProperties': False},
-        'categories': {'type': 'array', 'items': {'oneOf': [
-            {'$ref': '#/definitions/category'}
-        ]}, 'additionalItems': False, 'uniqueItems': True},
-
-        'transport': {'type': 'object', 'properties': {
-            'models': {'$ref': '#/definitions/models'},
-            'categories': {'$ref': '#/definitions/categories'},
-        }, 'required': ['models']},
-
-        'core': {'type': 'object', 'properties': {
-            'transport': {'$ref': '#/definitions/transport'},
-        }, 'additionalProperties': False},
-    }
-
-    common_definitions.update(specific)  # (pjs) order of 'definitions' has a sense
-    return common_definitions
-
-
-@pytest.fixture
-def core_schema(core_definitions):
-    return {'definitions': core_definitions}
-
-
 def test_solver_introspection(core_schema, solver_schema):
     definition2schema(core_schema, 'core')
     definition2schema(solver_schema, 'solver')
@@ -309,6 +198,14 @@ def test_core(core_schema):
         common.validate_model(document, core_schema)
 
 
+def test_solver_document(solver_schema, solver_document, core_document):
+    definition2schema(solver_schema, 'solver')
+    common.validate_solver(solver_document, solver_schema, core_document)
+
+    with pytest.raises(AssertionError):
+        common.validate_solver({'transport': 'M'}, solver_schema, core_document)  # refers to unknown category
+
+
 def test_transport(core_schema):
     definition2schema(core_schema, 'transport')
 
@@ -525,3 +422,70 @@ def test_x_attr(core_schema):
 
     x.value = 10
     assert x.value == 10
+
+
+def test_compile_schema(core_schema, core_document):
+    original = copy.deepcopy(core_schema)
+    compiled = common.compile_schema(core_schema, 'core')
+    assert core_schema == original  # not mutated
+    assert 'definitions' not in compiled and '$ref' not in json.dumps(compiled)
+
+    validate(core_document, compiled)
+    core_document['transport']['models'][0]['attrs'][0] = {'x_attr': {'name': 'x', 'value': 'abc'}}
+    with pytest.raises(js.exceptions.ValidationError):
+        validate(core_document, compiled)
+
+    definition2schema(core_schema, 'core')
+    assert common.compile_schema(core_schema) == compiled
+
+
+def test_compile_recursive():
+    schema = {'$schema': 'http://json-schema.org/draft-07/schema#', 'definitions': {
+        'a/b': {'type': 'object', 'properties': {
+            'children': {'type': 'array', 'items': {'$ref': '#/definitions/a~1b'}},
+            'enum': {'enum': [{'$ref': '#/definitions/unused'}]},
+            'remote': {'$ref': 'other.json#/definitions/a'},
+            'name': {'$ref': '#/definitions/name'},
+            'alias': {'$ref': '#/definitions/name'},
+            'any': True,
+        }},
+        'name': {'type': 'string'},
+        'unused': {'type': 'string'},
+    }}
+    compiled = common.compile_schema(schema, 'a/b')
+    assert compiled['$schema'] == schema['$schema'] and list(compiled['definitions']) == ['a/b']
+    assert compiled['properties']['entry'] is compiled['definitions']['a/b']
+    assert compiled['definitions']['a/b']['properties']['enum'] == schema['definitions']['a/b']['properties']['enum']
+    assert compiled['definitions']['a/b']['properties']['alias'] is compiled['definitions']['a/b']['properties']['name']
+    validate({'children': [{'children': []}]}, compiled)
+    with pytest.raises(js.exceptions.ValidationError):
+        validate({'children': [{'children': 1}]}, compiled)
+
+    schema = {'definitions': {'a': {'properties': {'b': {'items': {'$ref': '#/definitions/a/properties/b'}}}}}}
+    assert common.compile_schema(schema, 'a')['definitions'] == schema['definitions']  # left to the resolver
+
+    schema = {'properties': {'entry': {'properties': {'a': {'$ref': '#'}, 'b': {'$ref': '#/definitions/missing'}}}}}
+    assert common.compile_schema(schema) == schema
+    with pytest.raises(js.exceptions.RefResolutionError):
+        validate({'b': 1}, schema)
+
+
+def test_discriminate(core_schema, core_document):
+    compiled = common.compile_schema(core_schema, 'core')
+    items = compiled['properties']['entry']['properties']['transport']['properties']['models']['items']
+    attrs = items['oneOf'][0]['properties']['attrs']['items']
+    assert 'oneOf' not in attrs and list(attrs['properties']) == ['x_attr', 'y_type', 'z_attr']
+
+    core_document['transport']['models'][0]['attrs'].append({'w_attr': {'name': 'w'}})
+    with pytest.raises(js.exceptions.ValidationError, match="'w_attr' was unexpected"):
+        validate(core_document, compiled)
+    for attr in ({}, {'x_attr': {'name': 'x'}, 'z_attr': {'name': 'z'}}):
+        core_document['transport']['models'][0]['attrs'][-1] = attr
+        with pytest.raises(js.exceptions.ValidationError):
+            validate(core_document, compiled)
+
+    branch = {'type': 'object', 'properties': {'a': True}, 'required': ['a'], 'additionalProperties': False}
+    body = {'type': 'object', 'oneOf': [branch, dict(branch, properties={'b': True}, required=['b'])]}
+    assert common.discriminate(body)['oneOf'][0]['properties'] == {'a': True, 'b': True}  # kept apart from 'type'
+    for branches in ([branch, branch], [branch, dict(branch, properties={})], [branch, True], branch, []):
+        assert common.discriminate({'oneOf': branches}) == {'oneOf': branches}
@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+import jsonschema as js
+
+import metafoam
+from metafoam import instrument, snapshot
+from metafoam.registry import Registry
+from metafoam.common import definition2schema
+from metafoam.store import Missing
+
+
+@pytest.fixture
+def path(core_document, schema, tmp_path):
+    core_document['transport']['description'] = 'kept as is'
+    core_document['transport']['models'].append({'name': 'D', 'attrs': [{'y_type': {'name': 'w'}}]})
+    result = str(tmp_path / 'core.snapshot')
+    metafoam.Core(core_document, schema, lazy=True).save_snapshot(result)
+    return result
+
+
+def test_round_trip(path, core_document, schema, solver_document, solver_schema):
+    aggregator = instrument.Aggregator()
+    with instrument.hooked(aggregator):
+        core = metafoam.Core.load_snapshot(path, core_document, schema)
+    assert 'validate' not in aggregator.stats()  # hashes match
+    assert set(core.phases) == {'validate', 'index', 'snapshot', 'namespace'}
+
+    assert core.document == core_document
+    assert core.categories('transport') == {'K': ('A',), 'L': ('A', 'C')}
+    assert core.attrs('transport', 'A')['x'].value == 1
+    assert core.attrs('transport', 'D')['w'].has_value is False and core.models('transport')['D'][0]._value is Missing
+    assert core.attrs('transport', 'C') is core.attrs('transport', 'C')  # tables are shared through the restored pool
+
+    definition2schema(solver_schema, 'solver')
+    transport = metafoam.Solver(solver_document, solver_schema, core).transport
+    transport.model = 'A'
+    assert transport.attr('y').value == '1'
+
+
+def test_lazy(path, schema):
+    core = metafoam.Core.load_snapshot(path, lazy=True)
+    assert set(core.phases) == {'validate', 'index', 'snapshot'}
+    assert core.namespace() is metafoam.Core.load_snapshot(path, schema=schema).namespace()
+
+
+def test_stale(path, core_document, schema):
+    core_document['transport']['models'].pop()
+    core = metafoam.Core.load_snapshot(path, core_document)
+    assert 'snapshot' not in core.phases and list(core.models('transport')) == ['A', 'B', 'C']
+
+    core_document['transport']['models'].append({'name': 'E', 'attrs': 'many'})
+    with pytest.raises(js.exceptions.ValidationError):
+        metafoam.Core.load_snapshot(path, core_document, schema)
+
+    schema['definitions']['attrs']['minItems'] = 1
+    with pytest.raises(js.exceptions.ValidationError):
+        metafoam.Core.load_snapshot(path, schema=schema)  # the same document is re-validated against another schema
+
+
+def test_format(path, core_document, schema, tmp_path):
+    header = snapshot.header(path)
+    assert header == snapshot.read(path)[0]
+    assert header.document == metafoam.cache.fingerprint(core_document) and len(header.schema) == 64
+    assert header.size == os.path.getsize(path) - snapshot.Layout.size
+
+    with open(path, 'rb') as stream:
+        data = stream.read()
+    for content, message in ((data[:10], 'too short'), (b'X' + data[1:], 'unexpected magic'), (data[:-1], 'damaged')):
+        broken = str(tmp_path / 'broken')
+        with open(broken, 'wb') as stream:
+            stream.write(content)
+        with pytest.raises(ValueError, match=message):
+            metafoam.Core.load_snapshot(broken)
+
+    with pytest.raises(OSError):
+        snapshot.write(str(tmp_path), header.document, header.schema, None)  # can not replace a directory
+    assert sorted(os.listdir(str(tmp_path))) == ['broken', 'core.snapshot']
+
+
+def test_shared_pool(core_document, schema, tmp_path):
+    registry = Registry(schema)
+    registry.add('openfoam-6', core_document)
+    metafoam.Core(core_document, schema).save_snapshot(str(tmp_path / 'alone'))
+    registry['openfoam-6'].save_snapshot(str(tmp_path / 'before'))
+
+    for fork in range(3):  # unrelated definitions in the shared pool
+        models = [{'name': 'M{}'.format(index), 'attrs': [{'x_attr': {'name': 'a{}'.format(index)}}]} for index in range(50)]
+        registry.add(str(fork), {'transport': {'models': models, 'categories': []}})
+    registry['openfoam-6'].save_snapshot(str(tmp_path / 'after'))
+
+    sizes = set(os.path.getsize(str(tmp_path / name)) for name in ('alone', 'before', 'after'))
+    assert len(sizes) == 1
+    core = metafoam.Core.load_snapshot(str(tmp_path / 'after'), core_document, schema)
+    assert core.document == core_document and core.index('transport').store.pool.info().models == 3
@@ -0,0 +1,60 @@
+import json
+import sys
+
+import metafoam
+from metafoam.common import definition2schema
+from metafoam.store import AttrRecord, Missing, Pool, Store
+
+
+def test_round_trip(core_document):
+    core_document['transport']['description'] = 'kept as is'
+    core_document['transport']['models'].append({'name': 'D', 'comment': 'rare field'})
+    core_document['transport']['models'][0]['attrs'].append({'z_attr': {'name': 'n', 'value': None}})
+    core_document['transport']['models'][0]['attrs'].append({'y_type': {'name': 'w'}})
+    core_document['transport']['categories'][0]['comment'] = 'rare field'
+
+    store = Store(core_document['transport'])
+    assert store.to_document() == core_document['transport']
+    assert [model.name for model in store.models] == ['A', 'B', 'C', 'D']
+    assert store.models[3].attrs is None
+    assert dict(store.categories) == {'K': ('A',), 'L': ('A', 'C')}
+
+
+def test_records():
+    name = ''.join(['vis', 'cosity'])
+    pool = Pool()
+    first = Store({'models': [{'name': 'A', 'attrs': [{'x_attr': {'name': name}}]}]}, pool).models[0].attrs[0]
+    second = Store({'models': [{'name': 'B', 'attrs': [{''.join(['x_', 'attr']): {'name': 'viscosity'}}]}]}, pool).models[0]
+    assert first.name is sys.intern('viscosity')
+    assert first is second.attrs[0]  # shared by content
+    assert list(pool.types) == ['x_attr'] and len(pool.types) == 1
+    assert Store({}, pool).pool is pool
+    assert pool.info() == (1, 1, 2, 0)
+
+    assert first.value is None and not first.has_value
+    assert first == AttrRecord('viscosity', 'x_attr') and hash(first) == hash(AttrRecord('viscosity', 'x_attr'))
+    assert first != AttrRecord('viscosity', 'x_attr', None) and first != ('x_attr', None)
+    assert second != Store({'models': [{'name': 'B', 'attrs': [], 'comment': 'a'}]}, pool).models[0] != ('B', ())
+    assert AttrRecord('a', 'y_type', [1]) == AttrRecord('a', 'y_type', [1])
+    assert repr(first) == "AttrRecord('viscosity', 'x_attr', Missing)" and repr(Missing) == 'Missing'
+
+
+def test_typed_values():
+    values = [1, 1.0, True, '1', [1], [1.0], [True], '[1]', {'a': 1}, {'a': True}, None]
+    models = [{'name': str(index), 'attrs': [{'x_attr': {'name': 'x', 'value': value}}]} for index, value in enumerate(values)]
+    store = Store({'models': models})
+    assert store.pool.info().attrs == len(values)  # equal in Python, but distinct JSON values
+    assert json.dumps(store.to_document()) == json.dumps({'models': models})
+    assert AttrRecord('x', 'x_attr', '[1]') != AttrRecord('x', 'x_attr', [1])
+
+
+def test_core_document(core_schema, core_document):
+    definition2schema(core_schema, 'core')
+    core = metafoam.Core(core_document, core_schema)
+    assert core.document == core_document
+    assert core.document['transport'] is not core_document['transport']  # read-only view of the compact form
+
+    lazy = metafoam.Core(core_document, core_schema, lazy=True)
+    assert lazy.document == core_document
+    lazy.categories('transport')
+    assert lazy.document == core_document
@@ -0,0 +1,138 @@
+import io
+import json
+
+import pytest
+
+import jsonschema as js
+
+from metafoam import common, stream
+from metafoam.common import definition2schema
+
+
+def validate(document, schema, chunk=7):
+    text = document if isinstance(document, str) else json.dumps(document, indent=2)
+    stream.validate_stream(io.StringIO(text), schema, chunk)
+
+
+@pytest.mark.parametrize('chunk', [1, 2, 7, 65536])
+def test_valid(schema, core_document, chunk):
+    core_document['transport']['models'][0]['attrs'][0]['x_attr']['value'] = 1234567.125
+    core_document['transport']['description'] = 'values are split by chunk boundaries'
+    validate(core_document, schema, chunk)
+    common.validate_model(core_document, schema)
+
+    validate({'transport': {'models': [], 'categories': []}}, schema)
+    validate({}, schema, chunk)
+
+
+def test_invalid(schema, core_document):
+    with pytest.raises(js.exceptions.ValidationError):
+        validate({'transport': {'models': [{'name': 'a', 'attrs': [{'d_attr': {'name': 'd'}}]}]}}, schema)
+
+    with pytest.raises(js.exceptions.ValidationError, match='non-unique'):
+        validate({'transport': {'models': [{'name': 'a'}, {'name': 'a'}]}}, schema)
+
+    with pytest.raises(js.exceptions.ValidationError):
+        validate({'transport': {'categories': []}}, schema)  # check on 'required'
+
+    with pytest.raises(js.exceptions.ValidationError):
+        validate({'transport': {'models': [], 'other': {}}, 'a': 'b'}, schema)  # check on 'additionalProperties'
+
+    with pytest.raises(js.exceptions.ValidationError):
+        validate({'transport': {'models': {}}}, schema)  # not streamed, checked by the skeleton
+
+    with pytest.raises(js.exceptions.ValidationError):
+        validate({'transport': []}, schema)
+
+    with pytest.raises(js.exceptions.ValidationError):
+        validate([], schema)  # falls back to the whole document validation
+
+    with pytest.raises(AssertionError):
+        core_document['transport']['categories'].append({'name': 'M', 'models': ['D']})
+        validate(core_document, schema)  # categories should refer to existing models
+
+
+@pytest.mark.parametrize('text', ['{"transport": {"models": [}}', '{"transport" 1}', '{} {}', '{1: 2}', '{"a": 1 "b"'])
+def test_malformed(schema, text):
+    with pytest.raises(ValueError):
+        validate(text, schema)
+
+
+def test_partially_streamed(schema, core_document):
+    del schema['definitions']['transport']['properties']['categories']
+    assert list(stream.streamed(schema)) == ['models']
+    validate(core_document, schema)
+
+    core_document['transport']['categories'].append({'name': 'M', 'models': ['D']})
+    with pytest.raises(AssertionError):
+        validate(core_document, schema)
+
+
+def test_shared_definitions(schema, core_document):
+    schema['definitions']['core']['properties']['backup'] = {'$ref': '#/definitions/models'}
+    core_document['backup'] = core_document['transport']['models']
+    validate(core_document, schema)
+
+    core_document['backup'] = [{'name': 'A', 'attrs': 'many'}]  # not streamed, so checked as a whole
+    with pytest.raises(js.exceptions.ValidationError):
+        validate(core_document, schema)
+
+
+def test_not_streamed(core_document):
+    schema = {'definitions': {'core': {'type': 'object'}}}
+    definition2schema(schema, 'core')
+    validate(core_document, schema)
+
+    schema['definitions']['core'] = {'type': 'object', 'properties': {'transport': {'type': 'object', 'properties': {
+        'models': True,
+    }}}}
+    assert stream.streamed(schema) == {}
+
+
+def test_array(core_schema):
+    schema = {'definitions': {
+        'names': {'type': 'array', 'items': [{'type': 'string'}], 'minItems': 1, 'maxItems': 2},
+        'closed': {'type': 'array', 'items': [{'type': 'string'}], 'additionalItems': False},
+        'any': {'type': 'array'},
+    }}
+
+    array = stream.Array(schema, '#/definitions/names', 'names')
+    with pytest.raises(js.exceptions.ValidationError, match='at least'):
+        array.close()
+
+    for item in ('a', 1, None):
+        array.item(item)
+    with pytest.raises(js.exceptions.ValidationError, match='at most'):
+        array.close()
+
+    with pytest.raises(js.exceptions.ValidationError):
+        stream.Array(schema, '#/definitions/names', 'names').item(1)
+
+    array = stream.Array(schema, '#/definitions/closed', 'closed')
+    array.item('a')
+    with pytest.raises(js.exceptions.ValidationError, match='Additional items'):
+        array.item('b')
+
+    array = stream.Array(core_schema, '#/definitions/names', 'names')
+    array.item('a')
+    with pytest.raises(js.exceptions.ValidationError):
+        array.item(1)  # check on 'additionalItems'
+
+    array = stream.Array(schema, '#/definitions/any', 'any')
+    array.item({})
+    array.close()
+
+
+def test_validate_file(schema, core_document, tmp_path):
+    path = tmp_path / 'core.json'
+    path.write_text(json.dumps(core_document))
+    stream.validate_file(str(path), schema)
+
+
+def test_descend(schema):
+    assert common.descend(schema, '#/properties/entry', 'transport', 'models') == '#/definitions/models'
+    assert common.resolve(schema, '#/definitions/attrs/items/oneOf/1') == {'$ref': '#/definitions/y-attr'}
+
+    schema['definitions']['a~b/c'] = {'$ref': '#/definitions/a~0b~1c'}
+    with pytest.raises(AssertionError):
+        common.dereference(schema, '#/definitions/a~0b~1c')
@@ -0,0 +1,58 @@
+import pytest
+
+import metafoam
+from metafoam.common import definition2schema, validate_solver
+from metafoam.store import Store
+from metafoam.view import MappingView, SequenceView, view
+
+
+def test_view():
+    document = {'a': [1, {'b': 'c'}], 'd': None}
+    result = view(document)
+    assert isinstance(result, MappingView) and len(result) == 2 and 'a' in result and 'x' not in result
+    assert isinstance(result['a'], SequenceView) and result['a'][1]['b'] == 'c' and result['d'] is None
+    assert result['a'][:1] == [1] and result['a'] == (1, {'b': 'c'}) and result['a'] == view([1, {'b': 'c'}])
+    assert result['a'] != [1] and result['a'] != 'a' and result == document
+    assert repr(result['a'][:1]) == 'SequenceView([1])' and repr(view({})) == 'MappingView({})'
+
+    with pytest.raises(TypeError):
+        result['d'] = 1
+    with pytest.raises(TypeError):
+        result['a'][0] = 2
+    with pytest.raises(AttributeError):
+        result['a'].append(2)
+    with pytest.raises(TypeError):
+        hash(result['a'])
+
+    copy = result.to_dict()
+    assert copy == document and copy['a'] is not document['a'] and copy['a'][1] is not document['a'][1]
+    document['a'].append(2)
+    assert len(result['a']) == 3  # zero-copy
+
+
+def test_store_view(core_document):
+    core_document['transport']['description'] = 'kept as is'
+    core_document['transport']['categories'][0]['comment'] = 'rare field'
+
+    result = view(Store(core_document['transport']))
+    assert list(result) == ['models', 'categories', 'description'] and len(result) == 3
+    assert result['description'] == 'kept as is'
+    assert result['models'][0]['attrs'][1] == {'y_type': {'name': 'y', 'value': '1'}}
+    assert result['categories'][0] == {'name': 'K', 'models': ['A'], 'comment': 'rare field'}
+    assert [model['name'] for model in result['models'][1:]] == ['B', 'C']
+    assert result.to_dict() == core_document['transport'] and result == core_document['transport']
+    assert repr(result) == 'MappingView({!r})'.format(core_document['transport'])
+
+    with pytest.raises(KeyError):
+        result['extra']  # pylint: disable=pointless-statement
+
+
+def test_core_document(core_schema, core_document, solver_schema, solver_document):
+    definition2schema(core_schema, 'core')
+    core = metafoam.Core(core_document, core_schema)
+    with pytest.raises(TypeError):
+        core.document['transport']['models'][0]['name'] = 'Z'  # shared cores can not be changed by accident
+    assert core.document.to_dict() == core_document
+
+    definition2schema(solver_schema, 'solver')
+    validate_solver(solver_document, solver_schema, core.document)